@@ -15,9 +15,25 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from session_state import mark_files_touched
+
 # Tools that modify files and should trigger validation
 FILE_EDIT_TOOLS = {"editFiles", "createFile", "create_file", "replace_string_in_file"}
 
+# Tools known not to modify the workspace. Any other tool (including terminal
+# commands) marks the session as having touched files for the Stop hook.
+READ_ONLY_TOOLS = {
+    "read_file",
+    "list_dir",
+    "file_search",
+    "grep_search",
+    "semantic_search",
+    "get_errors",
+    "get_changed_files",
+    "fetch_webpage",
+    "github_repo",
+}
+
 # File patterns to validate
 TYPESCRIPT_EXTENSIONS = {".ts", ".tsx"}
 
@@ -101,6 +117,9 @@ def main() -> int:
     tool_input = input_data.get("tool_input", {})
     repo_root = Path(input_data.get("cwd", os.getcwd()))
 
+    if tool_name not in READ_ONLY_TOOLS:
+        mark_files_touched(repo_root, input_data.get("session_id"))
+
     # Only process file edit tools
     if tool_name not in FILE_EDIT_TOOLS:
         print(json.dumps({}))
@@ -10,69 +10,193 @@ Provides the agent with:
 - Snapshot summary (if available)
 """
 
+import asyncio
+import itertools
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from session_state import start_session
 
-def run_command(cmd: List[str], cwd: Optional[Path] = None) -> Optional[str]:
+# pygit2 is optional - reads git state in-process instead of spawning git
+try:
+    import pygit2
+
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
+
+async def run_command(cmd: List[str], cwd: Optional[Path] = None) -> Optional[str]:
     """Run a command and return stdout, or None on failure."""
     try:
-        result = subprocess.run(
-            cmd,
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
             cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=5,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        # Git/gh CLI not available or timed out; return None to skip this context.
-        pass
+    except OSError:
+        # Git/gh CLI not available; return None to skip this context.
+        return None
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        # Timed out; return None to skip this context.
+        process.kill()
+        await process.wait()
+        return None
+
+    if process.returncode == 0:
+        return stdout.decode("utf-8", errors="replace").strip()
     return None
 
 
-def get_git_context(repo_root: Path) -> Dict:
-    """Get current git context."""
-    context = {}
+def _parse_branch_header(header: str) -> Optional[str]:
+    """Extract the branch name from a `git status --branch` header line.
+
+    Handles the forms git emits:
+    - "## main...origin/main [ahead 1]"
+    - "## main"
+    - "## No commits yet on main"
+    - "## HEAD (no branch)"
+    """
+    header = header[3:].strip()
+    if header.startswith("No commits yet on "):
+        return header[len("No commits yet on ") :]
+    if header.startswith("HEAD (no branch)"):
+        # Match `git rev-parse --abbrev-ref HEAD` for a detached HEAD
+        return "HEAD"
+    branch = header.split("...", 1)[0].split(" ", 1)[0]
+    return branch or None
+
+
+def _count_staged_renames(repo: "pygit2.Repository", status: Dict) -> int:
+    """Count staged renames that `repo.status()` reports as a delete plus an add.
+
+    `git status --porcelain` detects renames between HEAD and the index and
+    prints one "R  old -> new" line for them, while pygit2 has no rename
+    detection and returns both paths.
+    """
+    if repo.head_is_unborn:
+        return 0
+    flags = status.values()
+    if not (
+        any(f & pygit2.GIT_STATUS_INDEX_NEW for f in flags)
+        and any(f & pygit2.GIT_STATUS_INDEX_DELETED for f in flags)
+    ):
+        # No rename candidates; skip the index diff
+        return 0
+
+    diff = repo.index.diff_to_tree(repo.head.peel(pygit2.Tree))
+    diff.find_similar(flags=pygit2.GIT_DIFF_FIND_RENAMES)
+    # The old path only disappears from porcelain output when nothing else
+    # (e.g. an untracked file recreated in its place) keeps it listed.
+    return sum(
+        1
+        for delta in diff.deltas
+        if delta.status == pygit2.GIT_DELTA_RENAMED
+        and status.get(delta.old_file.path) == pygit2.GIT_STATUS_INDEX_DELETED
+    )
 
-    # Current branch
-    branch = run_command(["git", "rev-parse", "--abbrev-ref", "HEAD"], repo_root)
-    if branch:
-        context["branch"] = branch
 
-    # Short SHA
-    sha = run_command(["git", "rev-parse", "--short", "HEAD"], repo_root)
-    if sha:
-        context["commit"] = sha
+def _get_git_context_pygit2(repo_root: Path) -> Optional[Dict]:
+    """Get current git context via pygit2, or None to fall back to the git CLI."""
+    if not PYGIT2_AVAILABLE:
+        return None
 
-    # Uncommitted changes count
-    status = run_command(["git", "status", "--porcelain"], repo_root)
-    if status is not None:
-        changes = len([line for line in status.split("\n") if line.strip()])
-        context["uncommitted_changes"] = changes
+    try:
+        repo_path = pygit2.discover_repository(str(repo_root))
+        if repo_path is None:
+            return None
+        repo = pygit2.Repository(repo_path)
+
+        context: Dict = {}
+        if repo.head_is_unborn:
+            # No commits yet: HEAD is a symbolic ref to the unborn branch
+            context["branch"] = repo.references["HEAD"].target.removeprefix(
+                "refs/heads/"
+            )
+        else:
+            head = repo.head
+            context["branch"] = "HEAD" if repo.head_is_detached else head.shorthand
+
+        status = repo.status(untracked_files="normal")
+        context["uncommitted_changes"] = sum(
+            1
+            for flags in status.values()
+            if flags not in (pygit2.GIT_STATUS_CURRENT, pygit2.GIT_STATUS_IGNORED)
+        ) - _count_staged_renames(repo, status)
+
+        if not repo.head_is_unborn:
+            # Match `git log`: newest first, but never a parent before its child
+            commits = itertools.islice(
+                repo.walk(
+                    repo.head.target,
+                    pygit2.GIT_SORT_TOPOLOGICAL | pygit2.GIT_SORT_TIME,
+                ),
+                3,
+            )
+            recent_commits = [
+                f"{c.short_id} {c.message.splitlines()[0] if c.message else ''}"
+                for c in commits
+            ]
+            context["commit"] = recent_commits[0].split(" ", 1)[0]
+            context["recent_commits"] = recent_commits
 
-    # Recent commits (last 3)
-    log = run_command(
-        ["git", "log", "-3", "--oneline", "--no-decorate"],
-        repo_root,
+        return context
+    except (pygit2.GitError, KeyError, TypeError, ValueError):
+        # Unsupported repository layout or older pygit2; use the git CLI.
+        return None
+
+
+async def get_git_context(repo_root: Path) -> Dict:
+    """Get current git context.
+
+    Reads the repository in-process with pygit2 when available. Otherwise
+    uses two git processes instead of one per field: the `status --branch`
+    header carries the branch name, and the abbreviated hash of the newest
+    `log` entry is the short SHA of HEAD.
+    """
+    # pygit2 is synchronous; run it off the event loop so it overlaps with
+    # the other context sources.
+    pygit2_context = await asyncio.to_thread(_get_git_context_pygit2, repo_root)
+    if pygit2_context is not None:
+        return pygit2_context
+
+    context = {}
+
+    # Branch and uncommitted changes (status), short SHA and recent commits (log)
+    status, log = await asyncio.gather(
+        run_command(["git", "status", "--porcelain=v1", "--branch"], repo_root),
+        run_command(["git", "log", "-3", "--format=%h %s"], repo_root),
     )
+
+    if status is not None:
+        lines = [line for line in status.split("\n") if line.strip()]
+        if lines and lines[0].startswith("## "):
+            branch = _parse_branch_header(lines.pop(0))
+            if branch:
+                context["branch"] = branch
+        context["uncommitted_changes"] = len(lines)
+
     if log:
-        context["recent_commits"] = log.split("\n")
+        recent_commits = log.split("\n")
+        context["commit"] = recent_commits[0].split(" ", 1)[0]
+        context["recent_commits"] = recent_commits
 
     return context
 
 
-def get_issue_context(repo_root: Path) -> Dict:
+async def get_issue_context(repo_root: Path) -> Dict:
     """Get open issue context if gh CLI is available."""
     context = {}
 
     # Check if gh CLI is available
-    issues_json = run_command(
+    issues_json = await run_command(
         [
             "gh",
             "issue",
@@ -122,6 +246,19 @@ def get_snapshot_summary(repo_root: Path) -> Dict:
         return {}
 
 
+async def gather_context(repo_root: Path) -> Tuple[Dict, Dict, Dict]:
+    """Gather git, issue and snapshot context concurrently.
+
+    The sources are independent and mostly wait on subprocesses (gh is
+    network-bound), so all their commands run at the same time.
+    """
+    return await asyncio.gather(
+        get_git_context(repo_root),
+        get_issue_context(repo_root),
+        asyncio.to_thread(get_snapshot_summary, repo_root),
+    )
+
+
 def main() -> int:
     """Main entry point."""
     # Read input from stdin
@@ -131,11 +268,12 @@ def main() -> int:
         input_data = {}
 
     repo_root = Path(input_data.get("cwd", os.getcwd()))
+    start_session(repo_root, input_data.get("session_id"))
 
     # Gather context
-    git_context = get_git_context(repo_root)
-    issue_context = get_issue_context(repo_root)
-    snapshot_context = get_snapshot_summary(repo_root)
+    git_context, issue_context, snapshot_context = asyncio.run(
+        gather_context(repo_root)
+    )
 
     # Build context message
     parts = []
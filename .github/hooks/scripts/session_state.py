@@ -0,0 +1,73 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""Per-session state shared between hook scripts.
+
+Records whether the current agent session may have modified files, so the
+Stop hook can skip its git checks for read-only sessions:
+- SessionStart resets the state for the new session
+- PostToolUse marks the session as having touched files
+- Stop reads the state
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+STATE_FILE = Path(".github") / "hooks" / ".session-state.json"
+
+
+def _state_path(repo_root: Path) -> Path:
+    return repo_root / STATE_FILE
+
+
+def _write_state(repo_root: Path, state: dict) -> None:
+    """Atomically write the state file; failures are ignored."""
+    path = _state_path(repo_root)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # State is only an optimization; the Stop hook falls back to git.
+        pass
+
+
+def _read_state(repo_root: Path) -> dict:
+    try:
+        with open(_state_path(repo_root), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def start_session(repo_root: Path, session_id: Optional[str]) -> None:
+    """Record that a new session started and has not touched files yet."""
+    if session_id:
+        _write_state(repo_root, {"session_id": session_id, "files_touched": False})
+
+
+def mark_files_touched(repo_root: Path, session_id: Optional[str]) -> None:
+    """Record that the session ran a tool that may have modified files."""
+    if not session_id:
+        return
+    state = _read_state(repo_root)
+    if state.get("session_id") == session_id and state.get("files_touched"):
+        return
+    _write_state(repo_root, {"session_id": session_id, "files_touched": True})
+
+
+def files_touched(repo_root: Path, session_id: Optional[str]) -> Optional[bool]:
+    """Return whether the session may have modified files.
+
+    Returns None when unknown (no state, or state from another session).
+    """
+    if not session_id:
+        return None
+    state = _read_state(repo_root)
+    if state.get("session_id") != session_id:
+        return None
+    return bool(state.get("files_touched"))
@@ -13,7 +13,20 @@ import os
 import subprocess
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from session_state import files_touched
+
+# pygit2 is optional - reads git state in-process instead of spawning git
+try:
+    import pygit2
+
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
+
+TYPESCRIPT_EXTENSIONS = (".ts", ".tsx")
 
 
 def run_command(cmd: List[str], cwd: Optional[Path] = None) -> Tuple[int, str]:
@@ -26,62 +39,120 @@ def run_command(cmd: List[str], cwd: Optional[Path] = None) -> Tuple[int, str]:
             text=True,
             timeout=10,
         )
-        return result.returncode, result.stdout.strip()
+        # Only strip trailing whitespace: leading spaces are significant in
+        # `git status --porcelain` output.
+        return result.returncode, result.stdout.rstrip()
     except (subprocess.TimeoutExpired, FileNotFoundError) as e:
         return 1, str(e)
 
 
-def has_uncommitted_changes(repo_root: Path) -> bool:
+def _load_status_pygit2(repo_root: Path) -> Optional[Dict[str, List[str]]]:
+    """Bucket paths into staged/modified/untracked via pygit2.
+
+    Returns None when pygit2 is unavailable or cannot read the repository,
+    so the caller falls back to the git CLI.
+    """
+    if not PYGIT2_AVAILABLE:
+        return None
+
+    try:
+        repo_path = pygit2.discover_repository(str(repo_root))
+        if repo_path is None:
+            return None
+        entries = pygit2.Repository(repo_path).status(untracked_files="all")
+    except (pygit2.GitError, TypeError, ValueError):
+        # Unsupported repository layout or older pygit2; use the git CLI.
+        return None
+
+    index_flags = (
+        pygit2.GIT_STATUS_INDEX_NEW
+        | pygit2.GIT_STATUS_INDEX_MODIFIED
+        | pygit2.GIT_STATUS_INDEX_DELETED
+        | pygit2.GIT_STATUS_INDEX_RENAMED
+        | pygit2.GIT_STATUS_INDEX_TYPECHANGE
+    )
+    worktree_flags = (
+        pygit2.GIT_STATUS_WT_MODIFIED
+        | pygit2.GIT_STATUS_WT_DELETED
+        | pygit2.GIT_STATUS_WT_RENAMED
+        | pygit2.GIT_STATUS_WT_TYPECHANGE
+    )
+
+    status: Dict[str, List[str]] = {"staged": [], "modified": [], "untracked": []}
+    for path, flags in entries.items():
+        if flags & pygit2.GIT_STATUS_WT_NEW:
+            status["untracked"].append(path)
+            continue
+        if flags & pygit2.GIT_STATUS_CONFLICTED:
+            # Porcelain reports merge conflicts ("UU", "AA", ...) with both
+            # the index and worktree columns set.
+            status["staged"].append(path)
+            status["modified"].append(path)
+            continue
+        if flags & index_flags:
+            status["staged"].append(path)
+        if flags & worktree_flags:
+            status["modified"].append(path)
+    return status
+
+
+def _load_status(repo_root: Path) -> Dict[str, List[str]]:
+    """Read git status once and bucket paths into staged/modified/untracked.
+
+    Uses pygit2 when available. Otherwise runs `git status` once; each
+    porcelain v1 line is "XY path", where X is the index (staged) state and
+    Y is the worktree state. Untracked files are reported as "??".
+    """
+    pygit2_status = _load_status_pygit2(repo_root)
+    if pygit2_status is not None:
+        return pygit2_status
+
+    status: Dict[str, List[str]] = {"staged": [], "modified": [], "untracked": []}
+
+    code, output = run_command(["git", "status", "--porcelain=v1", "-uall"], repo_root)
+    if code != 0 or not output:
+        return status
+
+    for line in output.split("\n"):
+        if len(line) < 4:
+            continue
+        index_state, worktree_state, path = line[0], line[1], line[3:]
+        # Renames/copies are reported as "old -> new"
+        if " -> " in path:
+            path = path.split(" -> ", 1)[1]
+        path = path.strip('"')
+
+        if index_state == "?":
+            status["untracked"].append(path)
+            continue
+        if index_state not in (" ", "!"):
+            status["staged"].append(path)
+        if worktree_state != " ":
+            status["modified"].append(path)
+
+    return status
+
+
+def has_uncommitted_changes(status: Dict[str, List[str]]) -> bool:
     """Check if there are uncommitted changes (tracked files only)."""
-    code, output = run_command(["git", "status", "--porcelain"], repo_root)
-    if code == 0 and output:
-        # Filter to only tracked files (staged/modified, not untracked with ??)
-        lines = [
-            line
-            for line in output.split("\n")
-            if line.strip() and not line.strip().startswith("??")
-        ]
-        return len(lines) > 0
-    return False
-
-
-def has_untracked_ts_files(repo_root: Path) -> bool:
+    return bool(status["staged"] or status["modified"])
+
+
+def has_untracked_ts_files(status: Dict[str, List[str]]) -> bool:
     """Check if there are untracked TypeScript files."""
-    code, output = run_command(["git", "status", "--porcelain"], repo_root)
-    if code == 0 and output:
-        for line in output.split("\n"):
-            if line.strip().startswith("??"):
-                # Extract filename from untracked entry (format: "?? path/to/file")
-                filename = line.strip()[3:].strip()
-                if filename.endswith((".ts", ".tsx")):
-                    return True
-    return False
-
-
-def has_staged_changes(repo_root: Path) -> bool:
-    """Check if there are staged but uncommitted changes."""
-    code, output = run_command(["git", "diff", "--cached", "--name-only"], repo_root)
-    return code == 0 and bool(output.strip())
+    return any(f.endswith(TYPESCRIPT_EXTENSIONS) for f in status["untracked"])
 
 
-def check_ts_files_changed(repo_root: Path) -> bool:
-    """Check if any TypeScript files were changed."""
-    code, output = run_command(
-        ["git", "diff", "--name-only", "HEAD"],
-        repo_root,
-    )
-    if code == 0 and output:
-        return any(f.endswith((".ts", ".tsx")) for f in output.split("\n"))
+def has_staged_changes(status: Dict[str, List[str]]) -> bool:
+    """Check if there are staged but uncommitted changes."""
+    return bool(status["staged"])
 
-    # Also check staged files
-    code, output = run_command(
-        ["git", "diff", "--cached", "--name-only"],
-        repo_root,
-    )
-    if code == 0 and output:
-        return any(f.endswith((".ts", ".tsx")) for f in output.split("\n"))
 
-    return False
+def check_ts_files_changed(status: Dict[str, List[str]]) -> bool:
+    """Check if any tracked TypeScript files were changed (staged or not)."""
+    return any(
+        f.endswith(TYPESCRIPT_EXTENSIONS) for f in status["staged"] + status["modified"]
+    )
 
 
 def main() -> int:
@@ -101,10 +172,18 @@ def main() -> int:
         print(json.dumps({}))
         return 0
 
+    # Skip all git work when this session did not run any file-modifying tool
+    if files_touched(repo_root, input_data.get("session_id")) is False:
+        print(json.dumps({}))
+        return 0
+
+    # Single git invocation shared by all checks below
+    status = _load_status(repo_root)
+
     # Check for uncommitted TypeScript changes (including new untracked TS files)
     ts_work_present = (
-        has_uncommitted_changes(repo_root) and check_ts_files_changed(repo_root)
-    ) or has_untracked_ts_files(repo_root)
+        has_uncommitted_changes(status) and check_ts_files_changed(status)
+    ) or has_untracked_ts_files(status)
     if ts_work_present:
         # There are uncommitted TS changes - remind about pre-commit checks
         response = {
@@ -123,7 +202,7 @@ def main() -> int:
         return 0
 
     # Check for staged but uncommitted changes
-    if has_staged_changes(repo_root):
+    if has_staged_changes(status):
         response = {
             "hookSpecificOutput": {
                 "hookEventName": "Stop",
@@ -0,0 +1,89 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import subprocess
+
+import pytest
+import session_start
+
+
+def init_repo(directory, branch):
+    """Create an empty repository whose unborn HEAD points at `branch`."""
+    subprocess.run(
+        ["git", "init", "-q", "-b", branch, str(directory)],
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_unborn_branch_with_slash_pygit2(tmp_path):
+    pytest.importorskip("pygit2")
+    init_repo(tmp_path, "feature/foo")
+
+    context = session_start._get_git_context_pygit2(tmp_path)
+
+    assert context is not None
+    assert context["branch"] == "feature/foo"
+    assert "commit" not in context
+
+
+def test_unborn_branch_with_slash_cli(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_start, "PYGIT2_AVAILABLE", False)
+    init_repo(tmp_path, "feature/foo")
+
+    context = asyncio.run(session_start.get_git_context(tmp_path))
+
+    assert context["branch"] == "feature/foo"
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """An empty repository whose commits all share one timestamp."""
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test Author")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+        monkeypatch.setenv(f"GIT_{var}_DATE", "2024-01-01T00:00:00+00:00")
+    init_repo(tmp_path, "main")
+    return tmp_path
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def get_context_both(repo, monkeypatch):
+    """Return the (pygit2, CLI) git context for the repository."""
+    pygit2_context = session_start._get_git_context_pygit2(repo)
+    with monkeypatch.context() as patch:
+        patch.setattr(session_start, "PYGIT2_AVAILABLE", False)
+        cli_context = asyncio.run(session_start.get_git_context(repo))
+    return pygit2_context, cli_context
+
+
+def test_recent_commits_with_equal_timestamps(repo, monkeypatch):
+    pytest.importorskip("pygit2")
+    for i in range(4):
+        git(repo, "commit", "-q", "--allow-empty", "-m", f"msg {i}")
+
+    pygit2_context, cli_context = get_context_both(repo, monkeypatch)
+
+    messages = [c.split(" ", 1)[1] for c in pygit2_context["recent_commits"]]
+    assert messages == ["msg 3", "msg 2", "msg 1"]
+    assert pygit2_context["recent_commits"] == cli_context["recent_commits"]
+
+
+def test_uncommitted_changes_count_staged_rename_once(repo, monkeypatch):
+    pytest.importorskip("pygit2")
+    for name in ("a.py", "b.py"):
+        (repo / name).write_text(f"{name} = 1\n" * 20, encoding="utf-8")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "Add files")
+    git(repo, "mv", "a.py", "renamed.py")
+    (repo / "b.py").write_text("changed\n", encoding="utf-8")
+    (repo / "new.py").write_text("new\n", encoding="utf-8")
+
+    pygit2_context, cli_context = get_context_both(repo, monkeypatch)
+
+    assert pygit2_context["uncommitted_changes"] == 3
+    assert cli_context["uncommitted_changes"] == 3
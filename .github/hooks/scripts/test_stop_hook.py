@@ -0,0 +1,83 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import subprocess
+
+import pytest
+import stop_hook
+
+pytest.importorskip("pygit2")
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """An empty git repository with a fixed committer identity."""
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test Author")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    git(tmp_path, "init", "-q", "-b", "main")
+    return tmp_path
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def commit_file(repo, name, content):
+    (repo / name).write_text(content, encoding="utf-8")
+    git(repo, "add", name)
+    git(repo, "commit", "-q", "-m", f"Update {name}")
+
+
+def load_status_both(repo, monkeypatch):
+    """Return the (pygit2, CLI) status buckets for the repository."""
+    pygit2_status = stop_hook._load_status_pygit2(repo)
+    with monkeypatch.context() as patch:
+        patch.setattr(stop_hook, "PYGIT2_AVAILABLE", False)
+        cli_status = stop_hook._load_status(repo)
+    return pygit2_status, cli_status
+
+
+def test_status_parity(repo, monkeypatch):
+    commit_file(repo, "a.ts", "a\n")
+    commit_file(repo, "b.ts", "b\n")
+    (repo / "a.ts").write_text("a2\n", encoding="utf-8")
+    (repo / "b.ts").write_text("b2\n", encoding="utf-8")
+    git(repo, "add", "b.ts")
+    (repo / "c.ts").write_text("c\n", encoding="utf-8")
+
+    pygit2_status, cli_status = load_status_both(repo, monkeypatch)
+
+    assert (
+        pygit2_status
+        == cli_status
+        == {
+            "staged": ["b.ts"],
+            "modified": ["a.ts"],
+            "untracked": ["c.ts"],
+        }
+    )
+
+
+def test_status_parity_merge_conflict(repo, monkeypatch):
+    commit_file(repo, "a.ts", "base\n")
+    git(repo, "checkout", "-q", "-b", "other")
+    commit_file(repo, "a.ts", "other\n")
+    git(repo, "checkout", "-q", "main")
+    commit_file(repo, "a.ts", "main\n")
+    result = subprocess.run(
+        ["git", "merge", "-q", "other"], cwd=repo, capture_output=True
+    )
+    assert result.returncode != 0
+
+    pygit2_status, cli_status = load_status_both(repo, monkeypatch)
+
+    assert (
+        pygit2_status
+        == cli_status
+        == {
+            "staged": ["a.ts"],
+            "modified": ["a.ts"],
+            "untracked": [],
+        }
+    )
@@ -3,22 +3,160 @@
 
 """Static code complexity analysis using radon for Python and regex patterns for TypeScript."""
 
+import ast
+import itertools
+import json
+import os
 import pathlib
 import re
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
-from .file_discovery import get_tracked_source_files
+from .file_discovery import (
+    get_repo_prefix,
+    get_tracked_source_files_grouped,
+    to_rel_path,
+)
 
 # Radon is optional - graceful fallback if not available
 try:
-    from radon.complexity import cc_visit
-    from radon.metrics import mi_visit
+    from radon.metrics import h_visit_ast, mi_compute
+    from radon.raw import analyze as raw_analyze
+    from radon.visitors import ComplexityVisitor
 
     RADON_AVAILABLE = True
 except ImportError:
     RADON_AVAILABLE = False
 
+# Hyperscan is optional - scans for all branch patterns at once when available
+try:
+    import hyperscan
+
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# orjson is optional - faster JSON encoding for the cache and CLI output
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Files handed to each worker process per task, to amortize pickling overhead
+PROCESS_CHUNKSIZE = 16
+
+# Per-file results are cached on disk keyed by (mtime, size), so repeated runs
+# only re-analyze files that changed. Bump CACHE_VERSION whenever the analysis
+# output changes so stale entries are discarded.
+CACHE_FILENAME = ".complexity-cache.json"
+CACHE_VERSION = 5
+
+# Python files larger than this (in characters) are typically generated code.
+# radon is skipped for them and only line counts are reported; those entries
+# are marked "oversized" because their code_lines is estimated without radon.
+MAX_PYTHON_FILE_SIZE = 1_000_000
+
+# Start of a Python line with code: not blank and not a `#` comment
+_PY_CODE_LINE_RE = re.compile(r"^[^\S\n]*[^\s#]", re.MULTILINE)
+
+# TypeScript function/method definitions
+# Matches: function name, async function name, methodName(, async methodName(
+_TS_FUNCTION_RE = re.compile(
+    r"^\s*(?:export\s+)?(?:async\s+)?(?:function\s+(\w+)|(\w+)\s*(?:<[^>]*>)?\s*\([^)]*\)\s*(?::\s*[^{]+)?\s*\{)",
+    re.MULTILINE,
+)
+
+# Start of a TypeScript line with code: not blank and not a `//` comment
+_TS_CODE_LINE_RE = re.compile(rb"^[^\S\n]*(?!//)\S", re.MULTILINE)
+
+# TypeScript complexity indicators (simplified cyclomatic complexity estimation)
+TS_BRANCH_PATTERNS = [
+    r"\bif\s*\(",
+    r"\belse\s+if\s*\(",
+    r"\belse\s*\{",
+    r"\bfor\s*\(",
+    r"\bwhile\s*\(",
+    r"\bswitch\s*\(",
+    r"\bcase\s+",
+    r"\bcatch\s*\(",
+    r"\?\?",  # nullish coalescing
+    r"\b\?\s*[^:]+\s*:",  # ternary
+    r"\|\|",  # logical or
+    r"&&",  # logical and
+]
+
+# Each indicator is counted on its own, like one re.findall per pattern, so
+# matches of different indicators never hide each other: `else if (` counts
+# for both `if (` and `else if (`, and a ternary does not swallow a `&&` that
+# precedes its `:`.
+_TS_BRANCH_RES = [re.compile(p) for p in TS_BRANCH_PATTERNS]
+
+
+def _compile_branch_database() -> Optional["hyperscan.Database"]:
+    """Compile TS_BRANCH_PATTERNS into a single hyperscan database."""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[p.encode("ascii") for p in TS_BRANCH_PATTERNS],
+            ids=list(range(len(TS_BRANCH_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(TS_BRANCH_PATTERNS),
+        )
+        return database
+    except hyperscan.error:
+        # Unsupported pattern/platform; use the Python regex instead.
+        return None
+
+
+_TS_BRANCH_DATABASE = _compile_branch_database()
+
+# hyperscan's \b and \s are ASCII-only, while Python's are Unicode-aware.
+# Ranges containing non-ASCII characters, or the ASCII separators \x1c-\x1f
+# that Python counts as whitespace, are counted with the regexes instead.
+_HYPERSCAN_UNSAFE_RE = re.compile(r"[^\x00-\x1b\x20-\x7f]")
+
+
+def _count_branches(text: str, start: int = 0, end: Optional[int] = None) -> int:
+    """Count branch indicators in ``text[start:end]`` of TypeScript source.
+
+    Uses hyperscan when available, otherwise one regex pass per pattern. Both
+    paths count each pattern's non-overlapping matches separately.
+    """
+    if end is None:
+        end = len(text)
+    if _TS_BRANCH_DATABASE is None or _HYPERSCAN_UNSAFE_RE.search(text, start, end):
+        # pos/endpos bound the search without copying the range
+        return sum(len(pattern.findall(text, start, end)) for pattern in _TS_BRANCH_RES)
+
+    # Hyperscan reports every (pattern, start, end) it finds, including
+    # overlapping ones. Keep the longest end for each pattern and start, which
+    # is what the greedy regex would match there.
+    longest: Dict[Tuple[int, int], int] = {}
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context) -> None:
+        key = (pattern_id, start)
+        if end > longest.get(key, -1):
+            longest[key] = end
+
+    _TS_BRANCH_DATABASE.scan(
+        text[start:end].encode("ascii"), match_event_handler=on_match
+    )
+
+    # Then select each pattern's non-overlapping matches left to right, like
+    # finditer does.
+    count = 0
+    positions = [0] * len(TS_BRANCH_PATTERNS)
+    for pattern_id, offset in sorted(longest):
+        if offset >= positions[pattern_id]:
+            count += 1
+            positions[pattern_id] = longest[pattern_id, offset]
+    return count
+
 
 @dataclass
 class FunctionComplexity:
@@ -49,9 +187,12 @@ class FileComplexity:
     max_complexity: int
     avg_complexity: float
     maintainability_index: Optional[float] = None
+    # Python file above MAX_PYTHON_FILE_SIZE: radon was skipped, so there are
+    # no functions and code_lines is an estimate (see analyze_python_file)
+    oversized: bool = False
 
     def to_dict(self) -> dict:
-        return {
+        data = {
             "path": self.path,
             "total_lines": self.total_lines,
             "code_lines": self.code_lines,
@@ -63,10 +204,15 @@ class FileComplexity:
             else None,
             "functions": [f.to_dict() for f in self.functions],
         }
+        if self.oversized:
+            data["oversized"] = True
+        return data
 
 
 def analyze_python_file(
-    filepath: pathlib.Path, repo_root: pathlib.Path
+    filepath: pathlib.Path,
+    repo_root: pathlib.Path,
+    rel_path: Optional[str] = None,
 ) -> Optional[FileComplexity]:
     """Analyze a Python file for complexity metrics."""
     if not RADON_AVAILABLE:
@@ -77,20 +223,51 @@ def analyze_python_file(
     except (UnicodeDecodeError, OSError):
         return None
 
-    lines = content.splitlines()
-    total_lines = len(lines)
-    code_lines = sum(
-        1 for line in lines if line.strip() and not line.strip().startswith("#")
-    )
+    if rel_path is None:
+        rel_path = filepath.relative_to(repo_root).as_posix()
+
+    if len(content) > MAX_PYTHON_FILE_SIZE:
+        # Count lines in C (str.count, regex scan) without parsing the file.
+        # Unlike radon's sloc, code_lines here also counts docstring and other
+        # multi-line string lines; the entry is marked "oversized" to say so.
+        total_lines = content.count("\n")
+        if content and not content.endswith("\n"):
+            total_lines += 1
+        return FileComplexity(
+            path=rel_path,
+            total_lines=total_lines,
+            code_lines=sum(1 for _ in _PY_CODE_LINE_RE.finditer(content)),
+            functions=[],
+            max_complexity=0,
+            avg_complexity=0.0,
+            oversized=True,
+        )
 
     try:
-        cc_results = cc_visit(content)
-        mi_score = mi_visit(content, multi=False)
+        # Parse once and share the AST between the complexity and
+        # maintainability metrics; cc_visit and mi_visit each parse on their own.
+        tree = ast.parse(content)
+        cc_visitor = ComplexityVisitor.from_ast(tree)
+        raw = raw_analyze(content)
     except SyntaxError:
         return None
 
+    # Same inputs as radon's mi_visit(content, multi=False)
+    comments_percent = raw.comments / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+    mi_score = mi_compute(
+        h_visit_ast(tree).total.volume,
+        cc_visitor.total_complexity,
+        raw.lloc,
+        comments_percent,
+    )
+
+    # Line counts come from radon's tokenize-based raw metrics, which are
+    # already needed for the maintainability index
+    total_lines = raw.loc
+    code_lines = raw.sloc
+
     functions = []
-    for block in cc_results:
+    for block in cc_visitor.blocks:
         # radon returns different block types (Function, Class, etc.)
         func = FunctionComplexity(
             name=block.name,
@@ -103,7 +280,6 @@ def analyze_python_file(
     max_cc = max((f.complexity for f in functions), default=0)
     avg_cc = sum(f.complexity for f in functions) / len(functions) if functions else 0
 
-    rel_path = filepath.relative_to(repo_root).as_posix()
     return FileComplexity(
         path=rel_path,
         total_lines=total_lines,
@@ -116,7 +292,9 @@ def analyze_python_file(
 
 
 def analyze_typescript_file(
-    filepath: pathlib.Path, repo_root: pathlib.Path
+    filepath: pathlib.Path,
+    repo_root: pathlib.Path,
+    rel_path: Optional[str] = None,
 ) -> Optional[FileComplexity]:
     """Analyze a TypeScript file for complexity metrics using regex patterns.
 
@@ -124,60 +302,39 @@ def analyze_typescript_file(
     consider using ts-morph or typescript compiler API.
     """
     try:
-        content = filepath.read_text(encoding="utf-8")
+        data = filepath.read_bytes()
+        content = data.decode("utf-8")
     except (UnicodeDecodeError, OSError):
         return None
 
-    lines = content.splitlines()
-    total_lines = len(lines)
-    code_lines = sum(
-        1 for line in lines if line.strip() and not line.strip().startswith("//")
-    )
-
-    # Find function/method definitions
-    # Matches: function name, async function name, methodName(, async methodName(
-    function_pattern = re.compile(
-        r"^\s*(?:export\s+)?(?:async\s+)?(?:function\s+(\w+)|(\w+)\s*(?:<[^>]*>)?\s*\([^)]*\)\s*(?::\s*[^{]+)?\s*\{)",
-        re.MULTILINE,
-    )
-
-    # Complexity indicators (simplified cyclomatic complexity estimation)
-    branch_patterns = [
-        r"\bif\s*\(",
-        r"\belse\s+if\s*\(",
-        r"\belse\s*\{",
-        r"\bfor\s*\(",
-        r"\bwhile\s*\(",
-        r"\bswitch\s*\(",
-        r"\bcase\s+",
-        r"\bcatch\s*\(",
-        r"\b\?\s*[^:]+\s*:",  # ternary
-        r"\?\?",  # nullish coalescing
-        r"\|\|",  # logical or
-        r"&&",  # logical and
-    ]
+    # Line counts come straight from the bytes, without building a line list
+    total_lines = data.count(b"\n")
+    if data and not data.endswith(b"\n"):
+        total_lines += 1
+    code_lines = sum(1 for _ in _TS_CODE_LINE_RE.finditer(data))
 
     functions = []
-    func_matches = list(function_pattern.finditer(content))
+    func_matches = list(_TS_FUNCTION_RE.finditer(content))
 
+    # Track line numbers incrementally instead of recounting from the top of
+    # the file for every function.
+    start_line = 1
+    previous_start = 0
     for i, match in enumerate(func_matches):
         func_name = match.group(1) or match.group(2) or "anonymous"
-        start_line = content[: match.start()].count("\n") + 1
+        start_line += content.count("\n", previous_start, match.start())
+        previous_start = match.start()
 
-        # Find function end (rough estimate - count braces)
+        # Find function end (rough estimate - up to the next function)
         func_end = len(content)
 
         if i + 1 < len(func_matches):
             func_end = func_matches[i + 1].start()
 
-        func_content = content[match.start() : func_end]
-
-        # Count complexity
-        complexity = 1  # Base complexity
-        for pattern in branch_patterns:
-            complexity += len(re.findall(pattern, func_content))
+        # Count complexity: base complexity plus one per branch indicator
+        complexity = 1 + _count_branches(content, match.start(), func_end)
 
-        length = func_content.count("\n") + 1
+        length = content.count("\n", match.start(), func_end) + 1
 
         functions.append(
             FunctionComplexity(
@@ -191,7 +348,8 @@ def analyze_typescript_file(
     max_cc = max((f.complexity for f in functions), default=0)
     avg_cc = sum(f.complexity for f in functions) / len(functions) if functions else 0
 
-    rel_path = filepath.relative_to(repo_root).as_posix()
+    if rel_path is None:
+        rel_path = filepath.relative_to(repo_root).as_posix()
     return FileComplexity(
         path=rel_path,
         total_lines=total_lines,
@@ -203,11 +361,116 @@ def analyze_typescript_file(
     )
 
 
-def find_source_files(
-    repo_root: pathlib.Path, extensions: List[str]
-) -> List[pathlib.Path]:
-    """Find all source files with given extensions using git ls-files."""
-    return get_tracked_source_files(repo_root, extensions)
+def _analyze_python_worker(
+    filepath: pathlib.Path, repo_root: pathlib.Path, rel_path: str
+) -> Optional[dict]:
+    """Process pool entry point for analyze_python_file."""
+    file_complexity = analyze_python_file(filepath, repo_root, rel_path)
+    return file_complexity.to_dict() if file_complexity else None
+
+
+def _analyze_typescript_worker(
+    filepath: pathlib.Path, repo_root: pathlib.Path, rel_path: str
+) -> Optional[dict]:
+    """Process pool entry point for analyze_typescript_file."""
+    file_complexity = analyze_typescript_file(filepath, repo_root, rel_path)
+    return file_complexity.to_dict() if file_complexity else None
+
+
+def _cache_path() -> pathlib.Path:
+    return pathlib.Path(__file__).parent / CACHE_FILENAME
+
+
+def _cache_load(repo_root: pathlib.Path) -> Dict[str, dict]:
+    """Load cached per-file results for repo_root, or an empty cache."""
+    try:
+        with open(_cache_path(), "rb") as f:
+            data = f.read()
+        cache = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    except (OSError, json.JSONDecodeError):
+        # Missing or unreadable cache; analyze everything.
+        return {}
+
+    if (
+        not isinstance(cache, dict)
+        or cache.get("version") != CACHE_VERSION
+        or cache.get("repo_root") != str(repo_root)
+    ):
+        return {}
+    return cache.get("files", {})
+
+
+def _cache_save(repo_root: pathlib.Path, files: Dict[str, dict]) -> None:
+    """Atomically write per-file results for repo_root to the cache."""
+    cache_path = _cache_path()
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        cache = {"version": CACHE_VERSION, "repo_root": str(repo_root), "files": files}
+        with open(tmp_path, "wb") as f:
+            if ORJSON_AVAILABLE:
+                f.write(orjson.dumps(cache))
+            else:
+                f.write(json.dumps(cache).encode("utf-8"))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Cache is best-effort (e.g., read-only install location).
+        pass
+
+
+def _map_files(
+    executor: Executor,
+    worker: Callable[[pathlib.Path, pathlib.Path, str], Optional[dict]],
+    files: List[pathlib.Path],
+    repo_root: pathlib.Path,
+    cache: Dict[str, dict],
+    new_cache: Dict[str, dict],
+) -> List[dict]:
+    """Run a per-file worker over files, dropping files that could not be analyzed.
+
+    Files whose (mtime, size) match a cache entry reuse the cached result;
+    only the remaining files are sent to the executor. Entries for every
+    analyzed file are recorded in new_cache.
+    """
+    results: List[Optional[dict]] = []
+    pending: List[Tuple[int, pathlib.Path, str, List[int]]] = []
+    repo_prefix = get_repo_prefix(repo_root)
+
+    for filepath in files:
+        try:
+            st = filepath.stat()
+        except OSError:
+            continue
+        rel_path = to_rel_path(filepath, repo_prefix)
+        stamp = [st.st_mtime_ns, st.st_size]
+
+        entry = cache.get(rel_path)
+        if entry is not None and entry["stamp"] == stamp:
+            new_cache[rel_path] = entry
+            results.append(entry["result"])
+        else:
+            pending.append((len(results), filepath, rel_path, stamp))
+            results.append(None)
+
+    computed = executor.map(
+        worker,
+        [filepath for _, filepath, _, _ in pending],
+        itertools.repeat(repo_root),
+        [rel_path for _, _, rel_path, _ in pending],
+        chunksize=PROCESS_CHUNKSIZE,
+    )
+    for (index, _, rel_path, stamp), result in zip(pending, computed):
+        if result is not None:
+            new_cache[rel_path] = {"stamp": stamp, "result": result}
+            results[index] = result
+
+    return [r for r in results if r is not None]
+
+
+def find_source_files_multi(
+    repo_root: pathlib.Path, ext_groups: Dict[str, List[str]]
+) -> Dict[str, List[pathlib.Path]]:
+    """Find source files for several extension groups in one discovery pass."""
+    return get_tracked_source_files_grouped(repo_root, ext_groups)
 
 
 def analyze_complexity(repo_root: pathlib.Path) -> dict:
@@ -221,19 +484,38 @@ def analyze_complexity(repo_root: pathlib.Path) -> dict:
         "typescript": [],
     }
 
-    # Analyze Python files
-    python_files = find_source_files(repo_root, [".py"])
-    for filepath in python_files:
-        file_complexity = analyze_python_file(filepath, repo_root)
-        if file_complexity:
-            results["python"].append(file_complexity.to_dict())
+    source_files = find_source_files_multi(
+        repo_root,
+        {
+            "python": [".py"],
+            "typescript": [".ts", ".tsx", ".js", ".jsx"],
+        },
+    )
+
+    cache = _cache_load(repo_root)
+    new_cache: Dict[str, dict] = {}
+
+    # Per-file analysis is CPU-bound (radon AST walks, regex scans), so fan it
+    # out across processes. Workers return plain dicts to keep pickling cheap.
+    with ProcessPoolExecutor() as executor:
+        results["python"] = _map_files(
+            executor,
+            _analyze_python_worker,
+            source_files["python"],
+            repo_root,
+            cache,
+            new_cache,
+        )
+        results["typescript"] = _map_files(
+            executor,
+            _analyze_typescript_worker,
+            source_files["typescript"],
+            repo_root,
+            cache,
+            new_cache,
+        )
 
-    # Analyze TypeScript/JavaScript files
-    ts_files = find_source_files(repo_root, [".ts", ".tsx", ".js", ".jsx"])
-    for filepath in ts_files:
-        file_complexity = analyze_typescript_file(filepath, repo_root)
-        if file_complexity:
-            results["typescript"].append(file_complexity.to_dict())
+    _cache_save(repo_root, new_cache)
 
     # Compute summary statistics
     all_files = results["python"] + results["typescript"]
@@ -288,8 +570,11 @@ def _get_high_complexity_functions(
 
 
 if __name__ == "__main__":
-    import json
-
     repo = pathlib.Path(__file__).parent.parent
     result = analyze_complexity(repo)
-    print(json.dumps(result, indent=2))
+    if ORJSON_AVAILABLE:
+        sys.stdout.buffer.write(
+            orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n"
+        )
+    else:
+        print(json.dumps(result, indent=2))
@@ -7,10 +7,15 @@ Scans code for common debt markers like TODO comments, large files,
 long functions, and code smells.
 """
 
+import functools
+import heapq
+import itertools
 import pathlib
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .file_discovery import get_tracked_source_files
 
@@ -67,15 +72,30 @@ class LongFunction:
         }
 
 
-# Debt marker patterns
+# Debt marker patterns, compiled once at import time. They are matched
+# against whole files, so whitespace is written as [^\S\r\n] to keep each
+# match on a single line and to ignore the \r of CRLF line endings.
+_DEBT_FLAGS = re.IGNORECASE | re.MULTILINE
 DEBT_PATTERNS = [
-    (r"#\s*(TODO|FIXME|HACK|XXX|BUG|REFACTOR|OPTIMIZE|REVIEW)[:\s](.*)$", "python"),
     (
-        r"//\s*(TODO|FIXME|HACK|XXX|BUG|REFACTOR|OPTIMIZE|REVIEW)[:\s](.*)$",
+        re.compile(
+            r"#[^\S\r\n]*(TODO|FIXME|HACK|XXX|BUG|REFACTOR|OPTIMIZE|REVIEW)(?::|[^\S\r\n])(.*)$",
+            _DEBT_FLAGS,
+        ),
+        "python",
+    ),
+    (
+        re.compile(
+            r"//[^\S\r\n]*(TODO|FIXME|HACK|XXX|BUG|REFACTOR|OPTIMIZE|REVIEW)(?::|[^\S\r\n])(.*)$",
+            _DEBT_FLAGS,
+        ),
         "typescript",
     ),
     (
-        r"/\*\s*(TODO|FIXME|HACK|XXX|BUG|REFACTOR|OPTIMIZE|REVIEW)[:\s](.*?)\*/",
+        re.compile(
+            r"/\*[^\S\r\n]*(TODO|FIXME|HACK|XXX|BUG|REFACTOR|OPTIMIZE|REVIEW)(?::|[^\S\r\n])(.*?)\*/",
+            _DEBT_FLAGS,
+        ),
         "typescript",
     ),
 ]
@@ -84,146 +104,139 @@ DEBT_PATTERNS = [
 LARGE_FILE_THRESHOLD = 500  # lines of code
 LONG_FUNCTION_THRESHOLD = 50  # lines
 
+# File type of each analyzed extension
+FILE_TYPES = {
+    ".py": "python",
+    ".ts": "typescript",
+    ".js": "typescript",
+    ".tsx": "typescript",
+    ".jsx": "typescript",
+}
 
-def find_debt_markers(
-    filepath: pathlib.Path, repo_root: pathlib.Path
-) -> List[DebtMarker]:
-    """Find TODO/FIXME/HACK markers in a file."""
-    try:
-        content = filepath.read_text(encoding="utf-8")
-    except (UnicodeDecodeError, OSError):
-        return []
+# Start of a line with code: not blank and not a `#` / `//` comment
+_PY_CODE_LINE_RE = re.compile(r"^[^\S\n]*[^\s#]", re.MULTILINE)
+_TS_CODE_LINE_RE = re.compile(r"^[^\S\n]*(?!//)\S", re.MULTILINE)
 
-    rel_path = filepath.relative_to(repo_root).as_posix()
-    markers = []
+# Python function definitions, matched against whole files
+_PY_FUNCTION_RE = re.compile(
+    r"^([^\S\n]*)(?:async[^\S\n]+)?def[^\S\n]+(\w+)[^\S\n]*\(", re.MULTILINE
+)
+
+# Files handed to each worker process per task, to amortize pickling overhead
+PROCESS_CHUNKSIZE = 32
+
+
+def get_file_type(filepath: pathlib.Path) -> Optional[str]:
+    """Return "python" or "typescript" for analyzable files, else None."""
+    return FILE_TYPES.get(filepath.suffix.lower())
 
-    # Determine file type
-    suffix = filepath.suffix.lower()
-    if suffix == ".py":
-        file_type = "python"
-    elif suffix in {".ts", ".js", ".tsx", ".jsx"}:
-        file_type = "typescript"
-    else:
-        return []
 
-    for pattern, pattern_type in DEBT_PATTERNS:
+def find_debt_markers(content: str, rel_path: str, file_type: str) -> List[DebtMarker]:
+    """Find TODO/FIXME/HACK markers in a file's content."""
+    markers = []
+
+    for regex, pattern_type in DEBT_PATTERNS:
         if pattern_type != file_type:
             continue
 
-        for line_num, line in enumerate(content.splitlines(), start=1):
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                marker_type = match.group(1).upper()
-                text = match.group(2).strip() if match.lastindex >= 2 else ""
-                markers.append(
-                    DebtMarker(
-                        file=rel_path,
-                        line=line_num,
-                        marker_type=marker_type,
-                        text=text,
-                    )
+        # Scan the whole file at once, tracking line numbers incrementally
+        line_num = 1
+        position = 0
+        last_line = 0
+        for match in regex.finditer(content):
+            line_num += content.count("\n", position, match.start())
+            position = match.start()
+            if line_num == last_line:
+                # Only the first match on each line counts
+                continue
+            last_line = line_num
+
+            marker_type = match.group(1).upper()
+            text = match.group(2).strip() if match.lastindex >= 2 else ""
+            markers.append(
+                DebtMarker(
+                    file=rel_path,
+                    line=line_num,
+                    marker_type=marker_type,
+                    text=text,
                 )
+            )
 
     return markers
 
 
 def analyze_file_size(
-    filepath: pathlib.Path, repo_root: pathlib.Path
+    content: str, rel_path: str, file_type: Optional[str]
 ) -> Optional[LargeFile]:
     """Check if a file exceeds size thresholds."""
-    try:
-        content = filepath.read_text(encoding="utf-8")
-    except (UnicodeDecodeError, OSError):
-        return None
-
-    lines = content.splitlines()
-    total_lines = len(lines)
+    # Count lines in C (str.count, regex scans) without looping over lines
+    total_lines = content.count("\n")
+    if content and not content.endswith("\n"):
+        total_lines += 1
 
     # Count code lines (non-empty, non-comment)
-    suffix = filepath.suffix.lower()
-    if suffix == ".py":
-        code_lines = sum(
-            1 for line in lines if line.strip() and not line.strip().startswith("#")
-        )
-    elif suffix in {".ts", ".js", ".tsx", ".jsx"}:
-        code_lines = sum(
-            1 for line in lines if line.strip() and not line.strip().startswith("//")
-        )
+    if file_type == "python":
+        code_lines = sum(1 for _ in _PY_CODE_LINE_RE.finditer(content))
+    elif file_type == "typescript":
+        code_lines = sum(1 for _ in _TS_CODE_LINE_RE.finditer(content))
     else:
         code_lines = total_lines
 
     if code_lines > LARGE_FILE_THRESHOLD:
-        rel_path = filepath.relative_to(repo_root).as_posix()
         return LargeFile(path=rel_path, total_lines=total_lines, code_lines=code_lines)
 
     return None
 
 
-def find_long_functions_python(
-    filepath: pathlib.Path, repo_root: pathlib.Path
-) -> List[LongFunction]:
-    """Find Python functions that exceed length threshold."""
-    try:
-        content = filepath.read_text(encoding="utf-8")
-    except (UnicodeDecodeError, OSError):
-        return []
+@functools.lru_cache(maxsize=None)
+def _dedent_re(indent: int) -> "re.Pattern[str]":
+    """Match a code line (not blank, not a comment) indented at most indent."""
+    return re.compile(rf"^[^\S\n]{{0,{indent}}}[^\s#]", re.MULTILINE)
 
-    rel_path = filepath.relative_to(repo_root).as_posix()
-    lines = content.splitlines()
-    long_funcs = []
 
-    # Simple pattern to find function definitions
-    func_pattern = re.compile(r"^(\s*)(?:async\s+)?def\s+(\w+)\s*\(")
+def find_long_functions_python(content: str, rel_path: str) -> List[LongFunction]:
+    """Find Python functions that exceed length threshold.
 
-    current_func = None
-    current_indent = 0
-    func_start = 0
-
-    for i, line in enumerate(lines):
-        match = func_pattern.match(line)
-        if match:
-            # Check previous function
-            if current_func:
-                length = i - func_start
-                if length > LONG_FUNCTION_THRESHOLD:
-                    long_funcs.append(
-                        LongFunction(
-                            file=rel_path,
-                            function_name=current_func,
-                            line=func_start + 1,
-                            length=length,
-                        )
-                    )
-
-            current_indent = len(match.group(1))
-            current_func = match.group(2)
-            func_start = i
+    A function ends at the next function definition or at the first code
+    line that is not indented deeper than its `def`, whichever comes first.
+    """
+    long_funcs = []
+    func_matches = list(_PY_FUNCTION_RE.finditer(content))
+
+    total_lines = content.count("\n")
+    if content and not content.endswith("\n"):
+        total_lines += 1
+
+    func_start = 0  # 0-based line index of the current definition
+    position = 0
+    for i, match in enumerate(func_matches):
+        func_start += content.count("\n", position, match.start())
+        position = match.start()
+
+        # Search for the end only up to the next definition
+        limit = len(content)
+        if i + 1 < len(func_matches):
+            limit = func_matches[i + 1].start()
+
+        body_start = content.find("\n", match.end(), limit)
+        dedent = None
+        if body_start != -1:
+            dedent = _dedent_re(len(match.group(1))).search(
+                content, body_start + 1, limit
+            )
 
-        # Detect when we've left the current function (dedent to same or less level)
-        elif current_func and line.strip():
-            line_indent = len(line) - len(line.lstrip())
-            if line_indent <= current_indent and not line.strip().startswith("#"):
-                # End of function
-                length = i - func_start
-                if length > LONG_FUNCTION_THRESHOLD:
-                    long_funcs.append(
-                        LongFunction(
-                            file=rel_path,
-                            function_name=current_func,
-                            line=func_start + 1,
-                            length=length,
-                        )
-                    )
-                current_func = None
+        if dedent is not None:
+            length = content.count("\n", match.start(), dedent.start())
+        elif limit < len(content):
+            length = content.count("\n", match.start(), limit)
+        else:
+            length = total_lines - func_start
 
-    # Check last function
-    if current_func:
-        length = len(lines) - func_start
         if length > LONG_FUNCTION_THRESHOLD:
             long_funcs.append(
                 LongFunction(
                     file=rel_path,
-                    function_name=current_func,
+                    function_name=match.group(2),
                     line=func_start + 1,
                     length=length,
                 )
@@ -233,16 +246,9 @@ def find_long_functions_python(
 
 
 def find_long_functions_typescript(
-    filepath: pathlib.Path, repo_root: pathlib.Path
+    lines: List[str], rel_path: str
 ) -> List[LongFunction]:
     """Find TypeScript functions that exceed length threshold."""
-    try:
-        content = filepath.read_text(encoding="utf-8")
-    except (UnicodeDecodeError, OSError):
-        return []
-
-    rel_path = filepath.relative_to(repo_root).as_posix()
-    lines = content.splitlines()
     long_funcs = []
 
     # Simplified pattern for function definitions
@@ -263,12 +269,10 @@ def find_long_functions_typescript(
 
             for j in range(i, len(lines)):
                 line = lines[j]
-                for char in line:
-                    if char == "{":
-                        brace_count += 1
-                        found_open = True
-                    elif char == "}":
-                        brace_count -= 1
+                opens = line.count("{")
+                if opens:
+                    found_open = True
+                brace_count += opens - line.count("}")
 
                 if found_open and brace_count == 0:
                     length = j - func_start + 1
@@ -292,6 +296,35 @@ def find_long_functions_typescript(
     return long_funcs
 
 
+def analyze_one_file(
+    filepath: pathlib.Path, repo_root: pathlib.Path
+) -> Tuple[List[DebtMarker], Optional[LargeFile], List[LongFunction]]:
+    """Run all debt checks on a file, reading it only once.
+
+    Returns:
+        Tuple of (debt markers, large file or None, long functions)
+    """
+    try:
+        content = filepath.read_text(encoding="utf-8")
+    except (UnicodeDecodeError, OSError):
+        return [], None, []
+
+    rel_path = filepath.relative_to(repo_root).as_posix()
+    file_type = get_file_type(filepath)
+
+    markers = find_debt_markers(content, rel_path, file_type) if file_type else []
+    large_file = analyze_file_size(content, rel_path, file_type)
+
+    if file_type == "python":
+        long_funcs = find_long_functions_python(content, rel_path)
+    elif file_type == "typescript":
+        long_funcs = find_long_functions_typescript(content.splitlines(), rel_path)
+    else:
+        long_funcs = []
+
+    return markers, large_file, long_funcs
+
+
 def analyze_debt(repo_root: pathlib.Path) -> dict:
     """Run complete debt indicator analysis.
 
@@ -303,45 +336,34 @@ def analyze_debt(repo_root: pathlib.Path) -> dict:
     long_functions: List[LongFunction] = []
 
     # Find all source files using git ls-files (respects .gitignore)
-    extensions = [".py", ".ts", ".js", ".tsx", ".jsx"]
-    source_files = get_tracked_source_files(repo_root, extensions)
-
-    # Analyze each file
-    for filepath in source_files:
-        # Find debt markers
-        markers = find_debt_markers(filepath, repo_root)
-        all_markers.extend(markers)
-
-        # Check file size
-        large_file = analyze_file_size(filepath, repo_root)
-        if large_file:
-            large_files.append(large_file)
-
-        # Find long functions
-        suffix = filepath.suffix.lower()
-        if suffix == ".py":
-            long_funcs = find_long_functions_python(filepath, repo_root)
-        elif suffix in {".ts", ".js", ".tsx", ".jsx"}:
-            long_funcs = find_long_functions_typescript(filepath, repo_root)
-        else:
-            long_funcs = []
-
-        long_functions.extend(long_funcs)
+    source_files = get_tracked_source_files(repo_root, list(FILE_TYPES))
+
+    # Per-file checks are CPU-bound (regex scans, line loops), so fan them
+    # out across processes. Results come back in source_files order.
+    with ProcessPoolExecutor() as executor:
+        for markers, large_file, long_funcs in executor.map(
+            analyze_one_file,
+            source_files,
+            itertools.repeat(repo_root),
+            chunksize=PROCESS_CHUNKSIZE,
+        ):
+            all_markers.extend(markers)
+            if large_file:
+                large_files.append(large_file)
+            long_functions.extend(long_funcs)
 
     # Group markers by type
-    markers_by_type: Dict[str, List[dict]] = {}
+    markers_by_type: Dict[str, List[dict]] = defaultdict(list)
     for marker in all_markers:
-        if marker.marker_type not in markers_by_type:
-            markers_by_type[marker.marker_type] = []
         markers_by_type[marker.marker_type].append(marker.to_dict())
 
-    # Sort large files and long functions
+    # Sort large files; only the top 50 long functions are reported
     large_files.sort(key=lambda f: f.code_lines, reverse=True)
-    long_functions.sort(key=lambda f: f.length, reverse=True)
+    top_long_functions = heapq.nlargest(50, long_functions, key=lambda f: f.length)
 
     return {
         "debt_markers": {
-            "by_type": markers_by_type,
+            "by_type": dict(markers_by_type),
             "total_count": len(all_markers),
             "summary": {
                 marker_type: len(markers)
@@ -354,7 +376,7 @@ def analyze_debt(repo_root: pathlib.Path) -> dict:
             "threshold": LARGE_FILE_THRESHOLD,
         },
         "long_functions": {
-            "functions": [f.to_dict() for f in long_functions[:50]],  # Top 50
+            "functions": [f.to_dict() for f in top_long_functions],
             "count": len(long_functions),
             "threshold": LONG_FUNCTION_THRESHOLD,
         },
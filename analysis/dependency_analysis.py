@@ -10,13 +10,27 @@ Analyzes import/export patterns to identify:
 - Fan-in/fan-out metrics
 """
 
+import functools
 import pathlib
 import re
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from .file_discovery import get_tracked_source_files
 
+# Import patterns, combined so each file is scanned once:
+# import { x } from './path'
+# import x from './path'
+# import * as x from './path'
+# import './path'
+# const x = require('./path')
+# import('./path')  (dynamic import)
+_IMPORT_RE = re.compile(
+    r'import\s+(?:[^\'";]+?\s+from\s+)?[\'"]([^\'"]+)[\'"]'
+    r'|(?:require|import)\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
+)
+
 
 @dataclass
 class ModuleInfo:
@@ -70,28 +84,19 @@ def extract_imports_typescript(
 
     imports = set()
 
-    # Match various import patterns:
-    # import { x } from './path'
-    # import x from './path'
-    # import * as x from './path'
-    # import './path'
-    # const x = require('./path')
-    import_patterns = [
-        r'import\s+(?:[^\'";]+?\s+from\s+)?[\'"]([^\'"]+)[\'"]',
-        r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
-        r'import\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',  # dynamic import
-    ]
+    # Cheap pre-check: every import form needs one of these keywords
+    if "import" not in content and "require" not in content:
+        return imports
 
-    for pattern in import_patterns:
-        for match in re.finditer(pattern, content):
-            import_path = match.group(1)
+    for match in _IMPORT_RE.finditer(content):
+        import_path = match.group(1) or match.group(2)
 
-            # Only track relative imports (local modules)
-            if import_path.startswith("."):
-                # Resolve relative path
-                resolved = resolve_import_path(filepath, import_path, repo_root)
-                if resolved:
-                    imports.add(resolved)
+        # Only track relative imports (local modules)
+        if import_path.startswith("."):
+            # Resolve relative path
+            resolved = resolve_import_path(filepath, import_path, repo_root)
+            if resolved:
+                imports.add(resolved)
 
     return imports
 
@@ -100,9 +105,21 @@ def resolve_import_path(
     from_file: pathlib.Path, import_path: str, repo_root: pathlib.Path
 ) -> Optional[str]:
     """Resolve a relative import path to a workspace-relative path."""
-    from_dir = from_file.parent
+    return _resolve_import_path(str(from_file.parent), import_path, str(repo_root))
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_import_path(
+    from_dir_str: str, import_path: str, repo_root_str: str
+) -> Optional[str]:
+    """Resolve an import relative to a directory.
+
+    Cached because sibling files often import the same modules, and each
+    resolution probes up to seven candidate paths on disk.
+    """
+    from_dir = pathlib.Path(from_dir_str)
     # Ensure repo_root is absolute for reliable relative_to() calls
-    repo_root = repo_root.resolve()
+    repo_root = pathlib.Path(repo_root_str).resolve()
 
     # Handle the import path
     # Remove ./ or ../ prefixes and resolve
@@ -122,7 +139,8 @@ def resolve_import_path(
     for candidate in candidates:
         if candidate.exists() and candidate.is_file():
             try:
-                return candidate.relative_to(repo_root).as_posix()
+                # Interned so every edge to a module shares one string
+                return sys.intern(candidate.relative_to(repo_root).as_posix())
             except ValueError:
                 return None
 
@@ -133,6 +151,9 @@ def build_dependency_graph(repo_root: pathlib.Path) -> Dict[str, ModuleInfo]:
     """Build a dependency graph of all TypeScript modules."""
     modules: Dict[str, ModuleInfo] = {}
 
+    # Files may have changed since a previous run in this process
+    _resolve_import_path.cache_clear()
+
     # Find all TypeScript/JavaScript files using git ls-files (respects .gitignore)
     # Skip test files for dependency analysis
     extensions = [".ts", ".tsx", ".js", ".jsx"]
@@ -140,7 +161,7 @@ def build_dependency_graph(repo_root: pathlib.Path) -> Dict[str, ModuleInfo]:
 
     # First pass: extract imports
     for filepath in source_files:
-        rel_path = filepath.relative_to(repo_root).as_posix()
+        rel_path = sys.intern(filepath.relative_to(repo_root).as_posix())
         imports = extract_imports_typescript(filepath, repo_root)
 
         modules[rel_path] = ModuleInfo(path=rel_path, imports=imports)
@@ -155,40 +176,50 @@ def build_dependency_graph(repo_root: pathlib.Path) -> Dict[str, ModuleInfo]:
 
 
 def find_circular_dependencies(modules: Dict[str, ModuleInfo]) -> List[List[str]]:
-    """Find circular dependency chains using DFS."""
-    cycles = []
-    visited = set()
-    rec_stack = set()
-
-    def dfs(node: str, path: List[str]) -> None:
-        if node in rec_stack:
-            # Found cycle - extract it
-            cycle_start = path.index(node)
-            cycle = path[cycle_start:] + [node]
-            # Normalize cycle (start from smallest element)
-            min_idx = cycle.index(min(cycle[:-1]))  # Exclude last element (duplicate)
-            normalized = cycle[min_idx:-1] + cycle[:min_idx] + [cycle[min_idx]]
-            if normalized not in cycles:
-                cycles.append(normalized)
-            return
-
-        if node in visited:
-            return
+    """Find circular dependency chains using DFS.
 
+    The DFS is iterative (an explicit stack of import iterators), so deep
+    import chains cannot hit the recursion limit.
+    """
+    cycles: List[List[str]] = []
+    seen_cycles: Set[Tuple[str, ...]] = set()
+    visited: Set[str] = set()
+    path: List[str] = []  # Current DFS path
+    path_index: Dict[str, int] = {}  # Position of each node in path
+    pending: List[Iterator[str]] = []  # Remaining imports of each node in path
+
+    def enter(node: str) -> None:
         visited.add(node)
-        rec_stack.add(node)
-
-        module = modules.get(node)
-        if module:
-            for imported in module.imports:
-                if imported in modules:
-                    dfs(imported, path + [node])
-
-        rec_stack.remove(node)
+        path_index[node] = len(path)
+        path.append(node)
+        pending.append(iter(modules[node].imports))
 
     for module_path in modules:
-        if module_path not in visited:
-            dfs(module_path, [])
+        if module_path in visited:
+            continue
+
+        enter(module_path)
+        while pending:
+            for imported in pending[-1]:
+                if imported not in modules:
+                    continue
+                if imported in path_index:
+                    # Found cycle - extract it and normalize it to start from
+                    # its smallest element
+                    cycle = path[path_index[imported] :]
+                    min_idx = cycle.index(min(cycle))
+                    normalized = cycle[min_idx:] + cycle[:min_idx]
+                    key = tuple(normalized)
+                    if key not in seen_cycles:
+                        seen_cycles.add(key)
+                        cycles.append(normalized + [normalized[0]])
+                elif imported not in visited:
+                    enter(imported)
+                    break
+            else:
+                # All imports of the node on top of the path are done
+                pending.pop()
+                del path_index[path.pop()]
 
     return cycles
 
@@ -251,13 +282,21 @@ def compute_layer_violations(modules: Dict[str, ModuleInfo]) -> List[dict]:
         "managers",
     ]
 
+    layer_index = {layer: i for i, layer in enumerate(layer_order)}
+    layer_cache: Dict[str, Optional[int]] = {}
+
     def get_layer(path: str) -> Optional[int]:
         """Get the layer index for a module path. Returns None for unknown layers."""
-        parts = path.lower().split("/")
-        for i, layer in enumerate(layer_order):
-            if layer in parts:
-                return i
-        return None  # Unknown layer
+        if path not in layer_cache:
+            layer_cache[path] = min(
+                (
+                    layer_index[part]
+                    for part in path.lower().split("/")
+                    if part in layer_index
+                ),
+                default=None,
+            )
+        return layer_cache[path]
 
     violations = []
     for module_path, module_info in modules.items():
@@ -3,23 +3,37 @@
 
 """Shared file discovery and filtering utilities for analysis modules."""
 
+import functools
+import os
 import pathlib
 import subprocess
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import pathspec
 
 
+@functools.lru_cache(maxsize=4)
+def _compile_gitignore(gitignore_path: str, mtime_ns: int) -> pathspec.PathSpec:
+    """Compile .gitignore patterns; mtime_ns is part of the cache key only."""
+    # Undecodable bytes must not abort discovery; they cannot match paths anyway
+    with open(gitignore_path, "rb") as f:
+        patterns = f.read().decode("utf-8", "replace").splitlines()
+
+    return pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+
+
 def load_gitignore(repo_root: pathlib.Path) -> Optional[pathspec.PathSpec]:
-    """Load .gitignore patterns."""
+    """Load .gitignore patterns.
+
+    The compiled spec is cached and only rebuilt when .gitignore changes.
+    """
     gitignore_path = repo_root / ".gitignore"
-    if not gitignore_path.exists():
+    try:
+        mtime_ns = gitignore_path.stat().st_mtime_ns
+    except OSError:
         return None
 
-    with open(gitignore_path, "r", encoding="utf-8") as f:
-        patterns = f.read().splitlines()
-
-    return pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+    return _compile_gitignore(str(gitignore_path), mtime_ns)
 
 
 # Common directories to skip during analysis
@@ -33,6 +47,10 @@ SKIP_DIRS = {
     ".vscode-test",
 }
 
+# SKIP_DIRS as path fragments, for checks against relative POSIX paths
+_SKIP_DIR_PREFIXES = tuple(f"{d}/" for d in SKIP_DIRS)
+_SKIP_DIR_INFIXES = tuple(f"/{d}/" for d in SKIP_DIRS)
+
 # Test-related path patterns to optionally skip
 TEST_PATH_PATTERNS = ["/test/", "/tests/", "/__tests__/", "/mocks/"]
 TEST_FILENAME_PREFIXES = ["test_"]
@@ -52,9 +70,39 @@ TEST_FILENAME_SUFFIXES = [
 ]
 
 
-def is_test_file(filepath: pathlib.Path, repo_root: pathlib.Path) -> bool:
+def get_repo_prefix(repo_root: pathlib.Path) -> str:
+    """Get the string prefix shared by all paths under repo_root.
+
+    Computed once per run so per-file relative paths can be derived by
+    slicing instead of calling Path.relative_to().
+    """
+    return os.path.join(str(repo_root), "")
+
+
+def to_rel_path(filepath: Union[pathlib.Path, str], repo_prefix: str) -> str:
+    """Get a repository-relative POSIX path for a file under the repo root.
+
+    Args:
+        filepath: Path to a file under the repository root
+        repo_prefix: Prefix returned by get_repo_prefix() for that root
+    """
+    path_str = str(filepath)
+    if path_str.startswith(repo_prefix):
+        rel_path = path_str[len(repo_prefix) :]
+    else:
+        # Paths joined onto Path(".") drop the "./" that the prefix keeps
+        rel_path = os.path.relpath(path_str, repo_prefix)
+    return rel_path if os.sep == "/" else rel_path.replace(os.sep, "/")
+
+
+def is_test_file(
+    filepath: pathlib.Path,
+    repo_root: pathlib.Path,
+    rel_path: Optional[str] = None,
+) -> bool:
     """Check if a file is a test file based on common naming conventions."""
-    rel_path = filepath.relative_to(repo_root).as_posix()
+    if rel_path is None:
+        rel_path = filepath.relative_to(repo_root).as_posix()
     filename = filepath.name
 
     # Check path patterns (e.g., /test/, /tests/)
@@ -77,6 +125,7 @@ def should_analyze_file(
     repo_root: pathlib.Path,
     gitignore: Optional[pathspec.PathSpec],
     skip_tests: bool = False,
+    rel_path: Optional[str] = None,
 ) -> bool:
     """Check if a file should be analyzed.
 
@@ -85,26 +134,60 @@ def should_analyze_file(
         repo_root: Root of the repository
         gitignore: Loaded gitignore patterns
         skip_tests: If True, also skip test files
+        rel_path: Precomputed repository-relative POSIX path, if available
     """
-    rel_path = filepath.relative_to(repo_root).as_posix()
+    if rel_path is None:
+        rel_path = filepath.relative_to(repo_root).as_posix()
 
     # Skip common non-source directories
-    rel_parts = filepath.relative_to(repo_root).parts
-    for part in rel_parts:
-        if part in SKIP_DIRS:
-            return False
+    if rel_path.startswith(_SKIP_DIR_PREFIXES) or any(
+        infix in rel_path for infix in _SKIP_DIR_INFIXES
+    ):
+        return False
 
     # Skip if matched by gitignore
     if gitignore and gitignore.match_file(rel_path):
         return False
 
     # Optionally skip test files
-    if skip_tests and is_test_file(filepath, repo_root):
+    if skip_tests and is_test_file(filepath, repo_root, rel_path):
         return False
 
     return True
 
 
+def _iter_source_paths(
+    root: str,
+    suffixes: Tuple[str, ...],
+    ignored_dirs: Optional[pathspec.PathSpec] = None,
+) -> Iterator[str]:
+    """Yield paths of files under root ending with one of suffixes.
+
+    Uses os.scandir directly so directories in SKIP_DIRS, and directories
+    matched by ignored_dirs, are pruned before they are read, and no Path
+    object is created for entries that are filtered out.
+    """
+    root_prefix = os.path.join(root, "")
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in SKIP_DIRS:
+                            continue
+                        if ignored_dirs is not None and ignored_dirs.match_file(
+                            to_rel_path(entry.path, root_prefix) + "/"
+                        ):
+                            continue
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffixes):
+                        yield entry.path
+        except OSError:
+            # Unreadable directory; skip it like rglob/os.walk would.
+            continue
+
+
 def get_tracked_source_files(
     repo_root: pathlib.Path,
     extensions: List[str],
@@ -134,16 +217,58 @@ def get_tracked_source_files(
             if line and any(line.endswith(ext) for ext in extensions):
                 filepath = repo_root / line
                 if filepath.exists():
-                    if skip_tests and is_test_file(filepath, repo_root):
+                    if skip_tests and is_test_file(filepath, repo_root, line):
                         continue
                     files.append(filepath)
         return files
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        # Fall back to rglob if git is not available
+        # Fall back to a filesystem walk if git is not available
         gitignore = load_gitignore(repo_root)
-        files = []
-        for ext in extensions:
-            for filepath in repo_root.rglob(f"*{ext}"):
-                if should_analyze_file(filepath, repo_root, gitignore, skip_tests):
-                    files.append(filepath)
-        return files
+        repo_prefix = get_repo_prefix(repo_root)
+
+        # Prune ignored directories during the walk, unless negated patterns
+        # could re-include files below an ignored directory
+        ignored_dirs = gitignore
+        if gitignore and any(p.include is False for p in gitignore.patterns):
+            ignored_dirs = None
+
+        candidates = []
+        for path in _iter_source_paths(str(repo_root), tuple(extensions), ignored_dirs):
+            rel_path = to_rel_path(path, repo_prefix)
+            filepath = pathlib.Path(path)
+            if should_analyze_file(filepath, repo_root, None, skip_tests, rel_path):
+                candidates.append((filepath, rel_path))
+
+        # Match the remaining files against .gitignore in one batch
+        ignored = (
+            set(gitignore.match_files(rel_path for _, rel_path in candidates))
+            if gitignore
+            else set()
+        )
+        return [
+            filepath for filepath, rel_path in candidates if rel_path not in ignored
+        ]
+
+
+def get_tracked_source_files_grouped(
+    repo_root: pathlib.Path,
+    ext_groups: Dict[str, List[str]],
+    skip_tests: bool = False,
+) -> Dict[str, List[pathlib.Path]]:
+    """Get source files bucketed by extension group from a single discovery pass.
+
+    Args:
+        repo_root: Root of the repository
+        ext_groups: Mapping of group name to extensions
+            (e.g., {"python": [".py"], "typescript": [".ts", ".tsx"]})
+        skip_tests: If True, filter out test files
+    """
+    group_by_ext = {ext: group for group, exts in ext_groups.items() for ext in exts}
+    grouped: Dict[str, List[pathlib.Path]] = {group: [] for group in ext_groups}
+
+    for filepath in get_tracked_source_files(repo_root, list(group_by_ext), skip_tests):
+        group = group_by_ext.get(filepath.suffix)
+        if group is not None:
+            grouped[group].append(filepath)
+
+    return grouped
@@ -12,17 +12,55 @@ Extracts metrics from git history:
 - File age analysis
 """
 
+import functools
+import heapq
+import os
 import pathlib
+import re
+import signal
 import subprocess
+import sys
+import threading
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set, Tuple
+from itertools import combinations
+from typing import AbstractSet, Dict, Iterator, List, Optional, Set, Tuple
 
 # Limit history analysis for performance
 MAX_COMMITS = 1000
 DAYS_OF_HISTORY = 365
 
+# Commit header line from --format=%H|%at|%aN. Anchoring on the full hex
+# hash (SHA-1 or SHA-256) keeps numstat rows for file names containing "|"
+# from being read as headers, and lets author names contain "|".
+_COMMIT_HEADER_RE = re.compile(r"([0-9a-f]{40}|[0-9a-f]{64})\|([^|]*)\|(.*)")
+
+# Commits touching more files than this are left out of temporal coupling.
+# Large changesets (mass renames, formatting, dependency bumps) say little
+# about which files belong together, and their pairs grow quadratically;
+# excluding changesets above 10 files is the usual cut-off in evolutionary
+# coupling analysis.
+MAX_CHANGESET_SIZE = 10
+
+# Files excluded from analysis, as one regex over the "/"-separated path:
+# generated and vendored paths, test directories (at any depth, including
+# the root), and test file naming conventions (test_*, *_test.py,
+# *_tests.py, *.test.*, *.spec.*)
+_SKIP_FILE_RE = re.compile(
+    r"node_modules/|dist/|\.vscode-test/|__pycache__/|\.git/"
+    r"|package-lock\.json|\.vsix"
+    r"|(?:^|/)(?:tests?|__tests__|mocks)/"
+    r"|(?:^|/)test_[^/]*$|_tests?\.py$|\.(?:test|spec)\.[^/]*$"
+)
+
+
+def _from_timestamp(timestamp: Optional[int]) -> Optional[datetime]:
+    """Convert a Unix timestamp from git to an aware UTC datetime."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
 
 @dataclass
 class FileStats:
@@ -32,9 +70,11 @@ class FileStats:
     change_count: int = 0
     lines_added: int = 0
     lines_removed: int = 0
-    authors: Set[str] = field(default_factory=set)
-    last_modified: Optional[datetime] = None
-    first_seen: Optional[datetime] = None
+    # Filled while parsing the log, then frozen once parsing is done
+    authors: AbstractSet[str] = field(default_factory=set)
+    # Unix timestamps; converted to datetimes only when serialized
+    last_modified_ts: Optional[int] = None
+    first_seen_ts: Optional[int] = None
 
     @property
     def churn(self) -> int:
@@ -46,8 +86,16 @@ class FileStats:
         """Number of unique authors who touched this file."""
         return len(self.authors)
 
-    def to_dict(self) -> dict:
-        """Convert to JSON-serializable dictionary."""
+    def to_dict(self, now: Optional[datetime] = None) -> dict:
+        """Convert to JSON-serializable dictionary.
+
+        Args:
+            now: Reference time for age_days (default: current time)
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+        last_modified = _from_timestamp(self.last_modified_ts)
+        first_seen = _from_timestamp(self.first_seen_ts)
         return {
             "path": self.path,
             "change_count": self.change_count,
@@ -56,13 +104,9 @@ class FileStats:
             "churn": self.churn,
             "author_count": self.author_count,
             "authors": sorted(self.authors),
-            "last_modified": self.last_modified.isoformat()
-            if self.last_modified
-            else None,
-            "first_seen": self.first_seen.isoformat() if self.first_seen else None,
-            "age_days": (datetime.now(timezone.utc) - self.last_modified).days
-            if self.last_modified
-            else None,
+            "last_modified": last_modified.isoformat() if last_modified else None,
+            "first_seen": first_seen.isoformat() if first_seen else None,
+            "age_days": (now - last_modified).days if last_modified else None,
         }
 
 
@@ -97,153 +141,228 @@ def run_git_command(args: List[str], cwd: pathlib.Path) -> str:
     return result.stdout
 
 
-def get_tracked_files(repo_root: pathlib.Path) -> Set[str]:
-    """Get set of currently tracked files in the repository."""
-    output = run_git_command(["ls-files"], repo_root)
-    return set(output.strip().split("\n")) if output.strip() else set()
+def stream_git_command(
+    args: List[str], cwd: pathlib.Path, timeout: float = 60
+) -> Iterator[str]:
+    """Run a git command and yield stdout line by line as it is produced.
+
+    Like run_git_command, the command is killed if it has not finished
+    within timeout seconds, and subprocess.TimeoutExpired is raised.
+    """
+    # On POSIX git runs in its own process group so that a timeout also kills
+    # children it spawned (hooks, aliases, pagers) that share its stdout pipe;
+    # killing git alone would leave the read blocked until they exit.
+    new_group = sys.platform != "win32"
+    proc = subprocess.Popen(
+        ["git"] + args,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        start_new_session=new_group,
+    )
+
+    # Reads from the pipe block, so the deadline is enforced by a timer
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        try:
+            if new_group:
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except ProcessLookupError:
+            # Exited just before the deadline
+            pass
+
+    watchdog = threading.Timer(timeout, kill)
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        yield from proc.stdout
+    finally:
+        watchdog.cancel()
+        proc.stdout.close()
+        returncode = proc.wait()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(proc.args, timeout)
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, proc.args)
 
 
-def analyze_git_log(repo_root: pathlib.Path) -> Dict[str, FileStats]:
+def get_tracked_files(repo_root: pathlib.Path) -> Set[str]:
+    """Get set of currently tracked files in the repository."""
+    # -z output is NUL-separated and never quotes unusual file names
+    output = run_git_command(["ls-files", "-z"], repo_root)
+    return set(output.split("\0")) - {""}
+
+
+def _renamed_path(filepath: str) -> str:
+    """Return the new path of a numstat rename entry ("a/{b => c}/d", "b => c")."""
+    if " => " not in filepath:
+        return filepath
+    prefix, brace, rest = filepath.partition("{")
+    if not brace:
+        return filepath.split(" => ", 1)[1]
+    middle, _, suffix = rest.partition("}")
+    new_middle = middle.split(" => ", 1)[1]
+    if not new_middle:
+        # "a/{b => }/c" is a move to "a/c"
+        suffix = suffix[1:]
+    return prefix + new_middle + suffix
+
+
+def analyze_git_log_and_coupling(
+    repo_root: pathlib.Path,
+    min_coupling: int = 3,
+    min_ratio: float = 0.3,
+    max_changeset_size: int = MAX_CHANGESET_SIZE,
+) -> Tuple[Dict[str, FileStats], List[TemporalCoupling]]:
     """
-    Parse git log to extract file statistics.
+    Parse git log to extract file statistics and temporal coupling.
 
-    Uses git log --numstat for efficient extraction of:
+    Uses a single streamed git log --numstat pass for efficient extraction of:
     - Change frequency per file
     - Lines added/removed per file
     - Authors per file
     - Timestamps
+    - Files that changed together in each commit
+
+    Args:
+        repo_root: Repository root path
+        min_coupling: Minimum number of co-changes to report
+        min_ratio: Minimum coupling ratio (0.0 to 1.0)
+        max_changeset_size: Commits touching more files are ignored for coupling
     """
-    file_stats: Dict[str, FileStats] = defaultdict(lambda: FileStats(path=""))
+    file_stats: Dict[str, FileStats] = {}
+
+    # Track which files changed in each commit
+    commit_files: Dict[str, Set[str]] = defaultdict(set)
+    file_change_count: Dict[str, int] = defaultdict(int)
+
+    current_commit: Optional[str] = None
+    current_commit_info: Optional[Tuple[str, int, str]] = None
 
     # Get commits from last N days, limited to MAX_COMMITS
     try:
-        log_output = run_git_command(
+        tracked_files = get_tracked_files(repo_root)
+        for line in stream_git_command(
             [
+                # Match the unquoted paths from ls-files -z for non-ASCII names
+                "-c",
+                "core.quotepath=off",
                 "log",
                 f"--since={DAYS_OF_HISTORY} days ago",
                 f"-n{MAX_COMMITS}",
                 "--numstat",
-                "--format=%H|%aI|%aN",
+                "--format=%H|%at|%aN",
                 "--no-merges",
+                # Deletions say nothing about files that still exist, and a
+                # rename is one change to the new path, not a delete and an add
+                "--diff-filter=ACMR",
+                "-M",
             ],
             repo_root,
-        )
-    except subprocess.CalledProcessError:
-        return {}
-
-    current_commit_info: Optional[Tuple[str, datetime, str]] = None
-    tracked_files = get_tracked_files(repo_root)
-
-    for line in log_output.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
+        ):
+            line = line.rstrip("\n")
+            if not line:
+                continue
 
-        # Check if this is a commit header line
-        if "|" in line and line.count("|") == 2:
-            parts = line.split("|")
-            if len(parts) == 3:
-                commit_hash, date_str, author = parts
+            # Check if this is a commit header line
+            header = _COMMIT_HEADER_RE.fullmatch(line)
+            if header:
+                commit_hash, date_str, author = header.groups()
+                # One shared string per author across all their commits
+                author = sys.intern(author)
+                current_commit = commit_hash
                 try:
-                    commit_date = datetime.fromisoformat(
-                        date_str.replace("Z", "+00:00")
-                    )
-                    current_commit_info = (commit_hash, commit_date, author)
+                    commit_ts = int(date_str)
+                    current_commit_info = (commit_hash, commit_ts, author)
                 except ValueError:
                     current_commit_info = None
                 continue
 
-        # Parse numstat line: "added\tremoved\tfilepath"
-        if current_commit_info and "\t" in line:
-            parts = line.split("\t")
-            if len(parts) >= 3:
-                added, removed, filepath = parts[0], parts[1], parts[2]
-
-                # Skip binary files (shown as "-")
-                if added == "-" or removed == "-":
-                    continue
-
-                # Only track files that currently exist
-                if filepath not in tracked_files:
-                    continue
-
-                # Skip test files and generated files for hotspot analysis
-                if _should_skip_file(filepath):
-                    continue
-
-                try:
-                    lines_added = int(added)
-                    lines_removed = int(removed)
-                except ValueError:
-                    continue
+            # Parse numstat line: "added\tremoved\tfilepath"
+            added, _, rest = line.partition("\t")
+            removed, sep, filepath = rest.partition("\t")
+            if not sep:
+                continue
+            filepath = _renamed_path(filepath)
+
+            # Coupling counts every file in the commit, including binaries
+            if (
+                current_commit
+                and filepath in tracked_files
+                and not _should_skip_file(filepath)
+            ):
+                commit_files[current_commit].add(filepath)
+                file_change_count[filepath] += 1
+
+            if not current_commit_info:
+                continue
 
-                _, commit_date, author = current_commit_info
+            # Skip binary files (shown as "-")
+            if added == "-" or removed == "-":
+                continue
 
-                if filepath not in file_stats:
-                    file_stats[filepath] = FileStats(path=filepath)
+            # Skip test files and generated files for hotspot analysis
+            if _should_skip_file(filepath):
+                continue
 
-                stats = file_stats[filepath]
-                stats.change_count += 1
-                stats.lines_added += lines_added
-                stats.lines_removed += lines_removed
-                stats.authors.add(author)
+            try:
+                lines_added = int(added)
+                lines_removed = int(removed)
+            except ValueError:
+                continue
 
-                # Track dates
-                if stats.last_modified is None or commit_date > stats.last_modified:
-                    stats.last_modified = commit_date
-                if stats.first_seen is None or commit_date < stats.first_seen:
-                    stats.first_seen = commit_date
+            _, commit_ts, author = current_commit_info
+
+            stats = file_stats.get(filepath)
+            if stats is None:
+                stats = file_stats[filepath] = FileStats(path=filepath)
+            stats.change_count += 1
+            stats.lines_added += lines_added
+            stats.lines_removed += lines_removed
+            stats.authors.add(author)
+
+            # Track dates
+            if stats.last_modified_ts is None or commit_ts > stats.last_modified_ts:
+                stats.last_modified_ts = commit_ts
+            if stats.first_seen_ts is None or commit_ts < stats.first_seen_ts:
+                stats.first_seen_ts = commit_ts
+    except subprocess.CalledProcessError:
+        return {}, []
+
+    # Only report files that currently exist; pruning the unique paths once is
+    # cheaper than a tracked-files lookup on every numstat row
+    file_stats = {
+        filepath: stats
+        for filepath, stats in file_stats.items()
+        if filepath in tracked_files
+    }
+    for stats in file_stats.values():
+        stats.authors = frozenset(stats.authors)
 
-    return dict(file_stats)
+    couplings = _find_temporal_coupling(
+        commit_files, file_change_count, min_coupling, min_ratio, max_changeset_size
+    )
+    return file_stats, couplings
 
 
+@functools.lru_cache(maxsize=8192)
 def _should_skip_file(filepath: str) -> bool:
     """Check if file should be excluded from analysis."""
     # Normalize path separators so patterns work cross-platform
-    normalized_path = filepath.replace("\\", "/")
-
-    skip_patterns = [
-        "node_modules/",
-        "dist/",
-        ".vscode-test/",
-        "__pycache__/",
-        ".git/",
-        "package-lock.json",
-        ".vsix",
-        # Skip test directories
-        "/test/",
-        "/tests/",
-        "/__tests__/",
-        "/mocks/",
-    ]
-    if any(pattern in normalized_path for pattern in skip_patterns):
-        return True
-
-    # Check filename-based test patterns
-    path = pathlib.Path(filepath)
-    filename = path.name
-
-    # Common test file naming conventions
-    if (
-        filename.startswith("test_")
-        or filename.endswith("_test.py")
-        or filename.endswith("_tests.py")
-        or ".test." in filename
-        or ".spec." in filename
-    ):
-        return True
-
-    # Skip files in well-known test directories (check path parts)
-    test_dirs = {"test", "tests", "__tests__", "mocks"}
-    dir_parts = path.parts[:-1]  # exclude the filename
-    if any(part in test_dirs for part in dir_parts):
-        return True
-
-    return False
-
-
-def analyze_temporal_coupling(
-    repo_root: pathlib.Path, min_coupling: int = 3, min_ratio: float = 0.3
+    return _SKIP_FILE_RE.search(filepath.replace("\\", "/")) is not None
+
+
+def _find_temporal_coupling(
+    commit_files: Dict[str, Set[str]],
+    file_change_count: Dict[str, int],
+    min_coupling: int,
+    min_ratio: float,
+    max_changeset_size: int,
 ) -> List[TemporalCoupling]:
     """
     Find files that frequently change together (temporal coupling).
@@ -252,63 +371,31 @@ def analyze_temporal_coupling(
     - Hidden dependencies
     - Copy-paste code
     - Features spread across files
-
-    Args:
-        repo_root: Repository root path
-        min_coupling: Minimum number of co-changes to report
-        min_ratio: Minimum coupling ratio (0.0 to 1.0)
     """
-    # Track which files changed in each commit
-    commit_files: Dict[str, Set[str]] = defaultdict(set)
-    file_change_count: Dict[str, int] = defaultdict(int)
-
-    try:
-        log_output = run_git_command(
-            [
-                "log",
-                f"--since={DAYS_OF_HISTORY} days ago",
-                f"-n{MAX_COMMITS}",
-                "--name-only",
-                "--format=%H",
-                "--no-merges",
-            ],
-            repo_root,
-        )
-    except subprocess.CalledProcessError:
-        return []
-
-    tracked_files = get_tracked_files(repo_root)
-    current_commit: Optional[str] = None
-
-    for line in log_output.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-
-        # Commit hash is 40 hex characters
-        if len(line) == 40 and all(c in "0123456789abcdef" for c in line):
-            current_commit = line
-            continue
-
-        if current_commit and line in tracked_files and not _should_skip_file(line):
-            commit_files[current_commit].add(line)
-            file_change_count[line] += 1
+    # Number files in path order, so sorting a commit's IDs also sorts its
+    # paths and each pair packs into one int key instead of a tuple of paths
+    id_to_file = sorted(file_change_count)
+    file_to_id = {filepath: file_id for file_id, filepath in enumerate(id_to_file)}
 
     # Calculate coupling between file pairs
-    coupling_count: Dict[Tuple[str, str], int] = defaultdict(int)
+    coupling_count: Dict[int, int] = defaultdict(int)
 
     for files in commit_files.values():
-        file_list = sorted(files)
-        for i, file1 in enumerate(file_list):
-            for file2 in file_list[i + 1 :]:
-                coupling_count[(file1, file2)] += 1
+        if len(files) > max_changeset_size:
+            continue
+        file_ids = sorted(file_to_id[filepath] for filepath in files)
+        for id1, id2 in combinations(file_ids, 2):
+            coupling_count[(id1 << 32) | id2] += 1
 
     # Filter and create coupling objects
     couplings: List[TemporalCoupling] = []
-    for (file1, file2), count in coupling_count.items():
+    for pair_key, count in coupling_count.items():
         if count < min_coupling:
             continue
 
+        file1 = id_to_file[pair_key >> 32]
+        file2 = id_to_file[pair_key & 0xFFFFFFFF]
+
         # Calculate coupling ratio relative to less-changed file
         min_changes = min(file_change_count[file1], file_change_count[file2])
         ratio = count / min_changes if min_changes > 0 else 0
@@ -323,9 +410,10 @@ def analyze_temporal_coupling(
                 )
             )
 
-    # Sort by coupling strength
-    couplings.sort(key=lambda c: (c.coupling_ratio, c.coupled_commits), reverse=True)
-    return couplings[:50]  # Top 50 couplings
+    # Top 50 couplings by coupling strength
+    return heapq.nlargest(
+        50, couplings, key=lambda c: (c.coupling_ratio, c.coupled_commits)
+    )
 
 
 def calculate_bus_factor(file_stats: Dict[str, FileStats]) -> dict:
@@ -375,22 +463,25 @@ def get_hotspots(file_stats: Dict[str, FileStats], top_n: int = 30) -> List[dict
     - Refactoring
     - Test coverage
     """
-    sorted_files = sorted(
-        file_stats.values(),
-        key=lambda s: (s.change_count, s.churn),
-        reverse=True,
+    top_files = heapq.nlargest(
+        top_n, file_stats.values(), key=lambda s: (s.change_count, s.churn)
     )
-    return [f.to_dict() for f in sorted_files[:top_n]]
+    # One reference time, so every age_days is measured from the same moment
+    now = datetime.now(timezone.utc)
+    return [f.to_dict(now) for f in top_files]
 
 
-def analyze_repository(repo_root: pathlib.Path) -> dict:
+def analyze_repository(
+    repo_root: pathlib.Path, max_changeset_size: int = MAX_CHANGESET_SIZE
+) -> dict:
     """
     Run complete git-based analysis on a repository.
 
     Returns a dictionary with all git metrics.
     """
-    file_stats = analyze_git_log(repo_root)
-    temporal_coupling = analyze_temporal_coupling(repo_root)
+    file_stats, temporal_coupling = analyze_git_log_and_coupling(
+        repo_root, max_changeset_size=max_changeset_size
+    )
     bus_factor = calculate_bus_factor(file_stats)
     hotspots = get_hotspots(file_stats)
 
@@ -404,6 +495,7 @@ def analyze_repository(repo_root: pathlib.Path) -> dict:
             "total_churn": sum(s.churn for s in file_stats.values()),
             "history_days": DAYS_OF_HISTORY,
             "max_commits": MAX_COMMITS,
+            "max_changeset_size": max_changeset_size,
         },
     }
 
@@ -13,9 +13,19 @@ import pathlib
 import subprocess
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Optional
 
+# orjson is optional - faster JSON encoding for large snapshots
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import analysis modules (relative imports for package structure)
 from .complexity_analysis import analyze_complexity
 from .debt_indicators import analyze_debt
@@ -29,23 +39,16 @@ SCHEMA_VERSION = "1.0.0"
 def get_git_info(repo_root: pathlib.Path) -> dict:
     """Get current git commit information."""
     try:
-        sha = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=repo_root,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=10,
-        ).stdout.strip()
-
-        short_sha = subprocess.run(
-            ["git", "rev-parse", "--short", "HEAD"],
+        # Commit fields in one call; only the branch name needs rev-parse
+        log_lines = subprocess.run(
+            ["git", "log", "-1", "--format=%H%n%h%n%s"],
             cwd=repo_root,
             capture_output=True,
             text=True,
             check=True,
             timeout=10,
-        ).stdout.strip()
+        ).stdout.splitlines()
+        sha, short_sha, message = (line.strip() for line in (log_lines + ["", ""])[:3])
 
         branch = subprocess.run(
             ["git", "rev-parse", "--abbrev-ref", "HEAD"],
@@ -56,16 +59,6 @@ def get_git_info(repo_root: pathlib.Path) -> dict:
             timeout=10,
         ).stdout.strip()
 
-        # Get commit message
-        message = subprocess.run(
-            ["git", "log", "-1", "--pretty=%s"],
-            cwd=repo_root,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=10,
-        ).stdout.strip()
-
         return {
             "sha": sha,
             "short_sha": short_sha,
@@ -81,6 +74,23 @@ def get_git_info(repo_root: pathlib.Path) -> dict:
         }
 
 
+def _priority_hotspot(hotspot: dict, complexity_info: dict) -> dict:
+    """Combine one git hotspot with its complexity metrics."""
+    # Priority score = change_count * max_complexity
+    # Higher score = more urgent attention needed
+    change_count = hotspot.get("change_count", 0)
+    max_complexity = complexity_info.get("max_complexity", 1)
+    return {
+        "path": hotspot["path"],
+        "change_count": change_count,
+        "churn": hotspot.get("churn", 0),
+        "max_complexity": max_complexity,
+        "avg_complexity": complexity_info.get("avg_complexity", 0),
+        "code_lines": complexity_info.get("code_lines", 0),
+        "priority_score": change_count * max_complexity,
+    }
+
+
 def compute_priority_hotspots(git_data: dict, complexity_data: dict) -> list:
     """Compute priority hotspots by combining change frequency with complexity.
 
@@ -88,36 +98,19 @@ def compute_priority_hotspots(git_data: dict, complexity_data: dict) -> list:
     for refactoring attention (the "X-Ray" approach from Software Design X-Rays).
     """
     # Build complexity lookup by path
-    complexity_by_path = {}
-    for lang_files in complexity_data.get("by_language", {}).values():
-        for file_data in lang_files:
-            complexity_by_path[file_data["path"]] = file_data
-
-    priority_hotspots = []
-    for hotspot in git_data.get("hotspots", []):
-        path = hotspot["path"]
-        complexity_info = complexity_by_path.get(path, {})
-
-        # Priority score = change_count * max_complexity
-        # Higher score = more urgent attention needed
-        change_count = hotspot.get("change_count", 0)
-        max_complexity = complexity_info.get("max_complexity", 1)
-        priority_score = change_count * max_complexity
-
-        priority_hotspots.append(
-            {
-                "path": path,
-                "change_count": change_count,
-                "churn": hotspot.get("churn", 0),
-                "max_complexity": max_complexity,
-                "avg_complexity": complexity_info.get("avg_complexity", 0),
-                "code_lines": complexity_info.get("code_lines", 0),
-                "priority_score": priority_score,
-            }
-        )
+    complexity_by_path = {
+        file_data["path"]: file_data
+        for lang_files in complexity_data.get("by_language", {}).values()
+        for file_data in lang_files
+    }
+
+    priority_hotspots = [
+        _priority_hotspot(hotspot, complexity_by_path.get(hotspot["path"], {}))
+        for hotspot in git_data.get("hotspots", [])
+    ]
 
     # Sort by priority score descending
-    priority_hotspots.sort(key=lambda x: x["priority_score"], reverse=True)
+    priority_hotspots.sort(key=itemgetter("priority_score"), reverse=True)
     return priority_hotspots[:20]  # Top 20
 
 
@@ -170,6 +163,15 @@ def compute_summary_metrics(
     }
 
 
+def serialize_snapshot(snapshot: dict) -> bytes:
+    """Serialize a snapshot as indented UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            snapshot, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(snapshot, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def generate_snapshot(
     repo_root: pathlib.Path, output_path: Optional[pathlib.Path] = None
 ) -> dict:
@@ -191,18 +193,24 @@ def generate_snapshot(
     print(f"  Commit: {git_info['short_sha']} ({git_info['branch']})", file=sys.stderr)
     print(f"  Time: {timestamp}", file=sys.stderr)
 
-    # Run all analyses
-    print("  Analyzing git history...", file=sys.stderr)
-    git_data = analyze_git(repo_root)
+    # Git history analysis mostly waits on git subprocesses, so it runs on a
+    # background thread. The other analyses stay on the main thread: complexity
+    # and debt each fork their own process pool, and running them one at a
+    # time keeps a single pool alive and forks only from the main thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        print("  Analyzing git history...", file=sys.stderr)
+        git_future = executor.submit(analyze_git, repo_root)
+
+        print("  Analyzing code complexity...", file=sys.stderr)
+        complexity_data = analyze_complexity(repo_root)
 
-    print("  Analyzing code complexity...", file=sys.stderr)
-    complexity_data = analyze_complexity(repo_root)
+        print("  Scanning for debt indicators...", file=sys.stderr)
+        debt_data = analyze_debt(repo_root)
 
-    print("  Scanning for debt indicators...", file=sys.stderr)
-    debt_data = analyze_debt(repo_root)
+        print("  Analyzing dependencies...", file=sys.stderr)
+        dependency_data = analyze_dependencies(repo_root)
 
-    print("  Analyzing dependencies...", file=sys.stderr)
-    dependency_data = analyze_dependencies(repo_root)
+        git_data = git_future.result()
 
     # Compute derived metrics
     print("  Computing priority hotspots...", file=sys.stderr)
@@ -231,8 +239,7 @@ def generate_snapshot(
     # Write output if path specified
     if output_path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        output_path.write_bytes(serialize_snapshot(snapshot))
         print(f"  Snapshot written to: {output_path}", file=sys.stderr)
 
     print("Analysis complete!", file=sys.stderr)
@@ -281,7 +288,7 @@ def main() -> int:
         snapshot = generate_snapshot(repo_root, args.output)
 
         if args.pretty:
-            print(json.dumps(snapshot, indent=2, ensure_ascii=False))
+            sys.stdout.buffer.write(serialize_snapshot(snapshot) + b"\n")
 
         return 0
     except Exception as e:
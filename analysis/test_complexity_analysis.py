@@ -0,0 +1,72 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import pytest
+
+from analysis import complexity_analysis
+from analysis.complexity_analysis import analyze_typescript_file
+
+TERNARY_WITH_AND = """\
+function pick(ready: boolean, a: boolean, b: boolean) {
+    return ready? a && b : fallback;
+}
+"""
+
+
+@pytest.fixture(params=["hyperscan", "regex"])
+def branch_scanner(request, monkeypatch):
+    """Run a test with each available branch-counting implementation."""
+    if request.param == "hyperscan":
+        if complexity_analysis._TS_BRANCH_DATABASE is None:
+            pytest.skip("hyperscan is not available")
+    else:
+        monkeypatch.setattr(complexity_analysis, "_TS_BRANCH_DATABASE", None)
+    return request.param
+
+
+def test_ternary_does_not_hide_logical_and(tmp_path, branch_scanner):
+    source = tmp_path / "pick.ts"
+    source.write_text(TERNARY_WITH_AND, encoding="utf-8")
+
+    result = analyze_typescript_file(source, tmp_path)
+
+    # 1 + ternary + `&&`; the ternary's `[^:]+` must not consume the `&&`
+    assert [f.complexity for f in result.functions] == [3]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("else if (x) {", 2),  # counts for both `if (` and `else if (`
+        ("x? a && b : c", 2),
+        ("a ?? b || c && d", 3),
+        ("const s = 'é'; if (x) {}", 1),
+    ],
+)
+def test_count_branches_per_pattern(branch_scanner, text, expected):
+    assert complexity_analysis._count_branches(text) == expected
+
+
+def test_oversized_python_file_is_marked(tmp_path, monkeypatch):
+    pytest.importorskip("radon")
+    source = tmp_path / "generated.py"
+    source.write_text('def f():\n    """Doc."""\n    return 1\n', encoding="utf-8")
+    monkeypatch.setattr(complexity_analysis, "MAX_PYTHON_FILE_SIZE", 10)
+
+    result = complexity_analysis.analyze_python_file(source, tmp_path).to_dict()
+
+    # radon is skipped, so code_lines still counts the docstring line
+    assert result["oversized"] is True
+    assert result["code_lines"] == 3
+    assert result["functions"] == []
+
+
+def test_regular_python_file_is_not_marked(tmp_path):
+    pytest.importorskip("radon")
+    source = tmp_path / "small.py"
+    source.write_text('def f():\n    """Doc."""\n    return 1\n', encoding="utf-8")
+
+    result = complexity_analysis.analyze_python_file(source, tmp_path).to_dict()
+
+    assert "oversized" not in result
+    assert result["code_lines"] == 2
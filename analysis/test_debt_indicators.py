@@ -0,0 +1,21 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import pytest
+
+from analysis.debt_indicators import find_debt_markers
+
+
+@pytest.mark.parametrize(
+    "lines, file_type",
+    [
+        (["x = 1  # TODO", "y = 2  # FIXME: handle y"], "python"),
+        (["// FIXME", "let y = 2; // HACK around y"], "typescript"),
+        (["/* TODO */", "/* XXX: remove */"], "typescript"),
+    ],
+)
+def test_crlf_markers_match_lf(lines, file_type):
+    lf = find_debt_markers("\n".join(lines) + "\n", "f", file_type)
+    crlf = find_debt_markers("\r\n".join(lines) + "\r\n", "f", file_type)
+
+    assert [m.to_dict() for m in crlf] == [m.to_dict() for m in lf]
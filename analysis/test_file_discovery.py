@@ -0,0 +1,29 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import os
+import pathlib
+
+import pytest
+
+from analysis.file_discovery import get_repo_prefix, to_rel_path
+
+
+@pytest.mark.parametrize("repo_root", [pathlib.Path("."), pathlib.Path("repo")])
+def test_to_rel_path_relative_root(tmp_path, monkeypatch, repo_root):
+    monkeypatch.chdir(tmp_path)
+    repo_prefix = get_repo_prefix(repo_root)
+
+    # Paths joined onto the root (as from git ls-files) and paths built by
+    # os.path.join (as from os.scandir) must both map to the same result
+    joined = repo_root / "analysis" / "git_analysis.py"
+    scanned = os.path.join(str(repo_root), "analysis", "git_analysis.py")
+
+    assert to_rel_path(joined, repo_prefix) == "analysis/git_analysis.py"
+    assert to_rel_path(scanned, repo_prefix) == "analysis/git_analysis.py"
+
+
+def test_to_rel_path_absolute_root(tmp_path):
+    repo_prefix = get_repo_prefix(tmp_path)
+
+    assert to_rel_path(tmp_path / "src" / "a.ts", repo_prefix) == "src/a.ts"
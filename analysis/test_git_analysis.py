@@ -0,0 +1,59 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from analysis.git_analysis import analyze_repository, stream_git_command
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """An empty git repository with a fixed committer identity."""
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test Author")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    return tmp_path
+
+
+def commit_file(repo, name, content):
+    (repo / name).write_text(content, encoding="utf-8")
+    subprocess.run(["git", "add", name], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", f"Add {name}"], cwd=repo, check=True)
+
+
+def hotspot_paths(repo):
+    return {h["path"] for h in analyze_repository(repo)["hotspots"]}
+
+
+def test_sees_files_committed_between_runs(repo):
+    commit_file(repo, "a.py", "a = 1\n")
+    assert hotspot_paths(repo) == {"a.py"}
+
+    commit_file(repo, "b.py", "b = 1\n")
+    assert hotspot_paths(repo) == {"a.py", "b.py"}
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs a POSIX shell alias")
+def test_stream_git_command_timeout(repo):
+    # The alias runs sleep as a child of git that holds the stdout pipe, so
+    # the read only returns once the whole process group is killed
+    args = ["-c", "alias.hang=!sleep 30", "hang"]
+
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(stream_git_command(args, repo, timeout=0.1))
+
+    assert time.monotonic() - start < 10
+
+
+def test_stream_git_command_lines(repo):
+    commit_file(repo, "a.py", "a = 1\n")
+
+    lines = list(stream_git_command(["ls-files"], repo))
+
+    assert lines == ["a.py\n"]